@@ -0,0 +1,71 @@
+"""
+Measures how long building and encoding typical interaction payloads takes
+with the stdlib encoder and with any of the optional faster encoders that are installed.
+
+    python benchmarks/serialize.py [iterations]
+"""
+import sys
+import timeit
+import discord
+from neocord.utils import _handle_send_prams, _to_json, _json_bytes
+from neocord.template import ResponseTemplate
+
+
+def _embed(index: int) -> discord.Embed:
+    embed = discord.Embed(title=f'Result {index}', description='lorem ipsum dolor sit amet ' * 20, colour=0x5865f2)
+    embed.set_author(name='neocord', icon_url='https://cdn.discordapp.com/embed/avatars/0.png')
+    embed.set_thumbnail(url='https://cdn.discordapp.com/embed/avatars/1.png')
+    embed.set_footer(text=f'page {index} of 10')
+    for field in range(10):
+        embed.add_field(name=f'field {field}', value='value ' * 10, inline=field % 2 == 0)
+    return embed
+
+
+def _view() -> discord.ui.View:
+    view = discord.ui.View(timeout=None)
+    for index in range(5):
+        view.add_item(discord.ui.Button(label=f'button {index}', custom_id=f'button:{index}'))
+    view.add_item(discord.ui.Select(
+        custom_id='select', options=[discord.SelectOption(label=f'option {index}') for index in range(25)]))
+    return view
+
+
+def _encoders():
+    encoders = {'json': _to_json}
+    try:
+        import orjson
+        encoders['orjson'] = orjson.dumps
+    except ImportError:
+        pass
+    try:
+        import ujson
+        encoders['ujson'] = ujson.dumps
+    except ImportError:
+        pass
+    return encoders
+
+
+def main(iterations: int = 2000):
+    cases = {
+        'text': {'content': 'pong'},
+        'embed': {'content': 'result', 'embed': _embed(0)},
+        'embeds+view': {'content': 'results', 'embeds': [_embed(i) for i in range(10)], 'view': _view()},
+    }
+    print(f'{"case":<14}{"stage":<10}{"encoder":<10}{"bytes":>8}{"us/op":>10}')
+    for case, kwargs in cases.items():
+        build = timeit.timeit(lambda: _handle_send_prams(**kwargs), number=iterations)
+        print(f'{case:<14}{"build":<10}{"":<10}{"":>8}{build / iterations * 1e6:>10.1f}')
+        payload, _, _ = _handle_send_prams(**kwargs)
+        payload = {'type': 4, 'data': payload}
+        for name, encoder in _encoders().items():
+            size = len(_json_bytes(encoder, payload))
+            taken = timeit.timeit(lambda: _json_bytes(encoder, payload), number=iterations)
+            print(f'{case:<14}{"encode":<10}{name:<10}{size:>8}{taken / iterations * 1e6:>10.1f}')
+        template = ResponseTemplate(**kwargs)
+        size = len(template.render().encode(callback=True))
+        taken = timeit.timeit(lambda: template.render().encode(callback=True), number=iterations)
+        print(f'{case:<14}{"template":<10}{"":<10}{size:>8}{taken / iterations * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
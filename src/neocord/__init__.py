@@ -14,9 +14,11 @@ from .bot import Bot
 from .mod import *
 from .cog import cog
 from .errors import *
-from .modal import Modal
+from .modal import Modal, modal_id
 from .context import Context
+from .template import ResponseTemplate, RenderedResponse
+from .files import StreamedFile
 from .input_chat import *
 from .input_user import UserCommand
 from .input_msg import MessageCommand
-from .enums import ChannelType, TextFieldLength, CommandType
+from .enums import ChannelType, TextFieldLength, CommandType, OverflowPolicy, BucketType
@@ -1,39 +1,96 @@
-import json
+import time
+import aiohttp
 import discord
 from .modal import Modal
+from .template import RenderedResponse
+from .input_chat import Choice
 from discord.http import Route
 from discord.utils import MISSING
-from .utils import _handle_send_prams, _handle_edit_params
+from .utils import _handle_send_prams, _handle_edit_params, _to_json, _json_bytes
 from typing import Optional, Any, Union, List, Dict, Sequence
 
 
 class Adapter:
-    def __init__(self, interaction: discord.Interaction):
+    def __init__(self, interaction: discord.Interaction, *, metrics_key: Optional[str] = None):
         self.ia = interaction
         self.id = interaction.id
         self.token = interaction.token
         self.client = interaction.client
         self.application_id = interaction.application_id
+        self.metrics_key = metrics_key
+        self.encoder = getattr(self.client, 'json_encoder', None) or _to_json
+
+    def _observe(self, stage: str, started: float):
+        metrics = getattr(self.client, 'metrics', None)
+        if metrics is not None and self.metrics_key is not None:
+            metrics.observe(self.metrics_key, stage, time.perf_counter() - started)
+
+    async def _request(self, route: Route, stage: str, **kwargs):
+        lane = getattr(self.client, 'interaction_http', None)
+        started = time.perf_counter()
+        try:
+            if lane is not None:
+                return await lane.request(route, self.token, **kwargs)
+            return await self.client.http.request(route, **kwargs)
+        finally:
+            self._observe(stage, started)
+
+    async def _send(
+            self,
+            route: Route,
+            stage: str,
+            payload: Dict[str, Any],
+            form: Optional[list] = None,
+            files: Optional[List[discord.File]] = None,
+    ):
+        # multipart is only needed to upload attachments, everything else goes as a plain json body
+        body = _json_bytes(self.encoder, payload)
+        if not form:
+            data = aiohttp.BytesPayload(body, content_type='application/json')
+            return await self._request(route, stage, data=data)
+        form.insert(0, {'name': 'payload_json', 'value': body.decode('utf-8')})  # type: ignore
+        try:
+            # the files are rewound before every retry and streamed by aiohttp in chunks
+            return await self._request(route, stage, form=form, files=files)
+        finally:
+            for file in files or ():
+                file.close()
+
+    async def _send_rendered(self, route: Route, stage: str, body: bytes):
+        data = aiohttp.BytesPayload(body, content_type='application/json')
+        return await self._request(route, stage, data=data)
+
+    def _store_views(self, views: Sequence[discord.ui.View], message_id: int):
+        for view in views:
+            self.client._connection.store_view(view, message_id)
 
     async def original_message(self):
-        return await self.ia.original_message()
+        if getattr(self.client, 'interaction_http', None) is not None:
+            r = Route('GET', f'/webhooks/{self.application_id}/{self.token}/messages/@original')
+            data = await self._request(r, 'http.original')
+            return discord.Message(state=self.client._connection, data=data, channel=self.ia.channel)  # type: ignore
+        started = time.perf_counter()
+        try:
+            return await self.ia.original_response()
+        finally:
+            self._observe('http.original', started)
 
     async def post_modal(self, *, modal: Modal):
         r = Route('POST', f'/interactions/{self.id}/{self.token}/callback')
-        await self.client.http.request(r, json=modal.to_payload())
+        await self._send(r, 'http.callback', modal.to_payload())
 
     async def post_to_delay(self, ephemeral: bool = False):
         route = Route('POST', f'/interactions/{self.id}/{self.token}/callback')
         payload = {'type': 5}
         if ephemeral:
             payload['data'] = {'flags': 64}
-        await self.client.http.request(route, json=payload)
+        await self._send(route, 'http.callback', payload)
 
     async def post_autocomplete_response(self, choices) -> None:
         r = Route('POST', f'/interactions/{self.id}/{self.token}/callback')
-        payload = {'type': 8, 'data': {'choices': [c.data for c in choices]}}
+        payload = {'type': 8, 'data': {'choices': [c.data if isinstance(c, Choice) else c for c in choices]}}
         try:
-            await self.client.http.request(r, json=payload)
+            await self._send(r, 'http.callback', payload)
         except discord.errors.NotFound:
             pass
 
@@ -51,22 +108,45 @@ class Adapter:
             view: Optional[discord.ui.View] = None,
             views: Optional[List[discord.ui.View]] = None
     ):
-        payload, form = _handle_send_prams(
+        payload, form, fs = _handle_send_prams(
             content=content, tts=tts, file=file, files=files, embed=embed, embeds=embeds,
             view=view, views=views, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
 
-        data = {'name': 'payload_json', 'value': json.dumps({'type': 4, 'data': payload})}
-
-        form.insert(0, data)  # type: ignore
         r = Route('POST', f'/interactions/{self.id}/{self.token}/callback')
-        await self.client.http.request(r, form=form, files=files)
+        await self._send(r, 'http.callback', {'type': 4, 'data': payload}, form, fs)
 
+        if not view and not views:
+            return None
+        # views are bound to the message id, the only reason to fetch the response here
         message = await self.original_message()
         if view:
             self.client._connection.store_view(view, message.id)
         if views:
             for view in views:
                 self.client._connection.store_view(view, message.id)
+        return message
+
+    async def post_rendered(self, rendered: RenderedResponse, *, ephemeral: bool = False):
+        r = Route('POST', f'/interactions/{self.id}/{self.token}/callback')
+        await self._send_rendered(r, 'http.callback', rendered.encode(ephemeral=ephemeral, callback=True))
+        views = rendered.template.views
+        if not views:
+            return None
+        message = await self.original_message()
+        self._store_views(views, message.id)
+        return message
+
+    async def post_followup_rendered(self, rendered: RenderedResponse, *, ephemeral: bool = False):
+        r = Route('POST', f'/webhooks/{self.application_id}/{self.token}')
+        message_data = await self._send_rendered(r, 'http.followup', rendered.encode(ephemeral=ephemeral))
+        self._store_views(rendered.template.views, int(message_data['id']))
+        return message_data
+
+    async def patch_rendered(self, rendered: RenderedResponse):
+        r = Route('PATCH', f'/webhooks/{self.application_id}/{self.token}/messages/@original')
+        message_data = await self._send_rendered(r, 'http.edit', rendered.encode())
+        self._store_views(rendered.template.views, int(message_data['id']))
+        return message_data
 
     async def post_followup(
             self,
@@ -83,16 +163,13 @@ class Adapter:
             views: Optional[List[discord.ui.View]] = None
 
     ):
-        payload, form = _handle_send_prams(
+        payload, form, fs = _handle_send_prams(
             content=content, tts=tts, file=file, files=files, embed=embed, embeds=embeds,
             view=view, views=views, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
 
         payload['wait'] = True
-        data = {'name': 'payload_json', 'value': json.dumps(payload)}
-
-        form.insert(0, data)  # type: ignore
         r = Route('POST', f'/webhooks/{self.application_id}/{self.token}')
-        message_data = await self.client.http.request(r, form=form, files=files)
+        message_data = await self._send(r, 'http.followup', payload, form, fs)
         message_id = int(message_data['id'])
         if view:
             self.client._connection.store_view(view, message_id)
@@ -113,15 +190,12 @@ class Adapter:
             view: Optional[discord.ui.View] = MISSING,
             views: Optional[List[discord.ui.View]] = MISSING
     ):
-        payload, form = _handle_edit_params(
+        payload, form, fs = _handle_edit_params(
             content=content, file=file, files=files, embed=embed,
             embeds=embeds, view=view, views=views, allowed_mentions=allowed_mentions)
 
-        data = {'name': 'payload_json', 'value': json.dumps(payload)}
-
-        form.insert(0, data)  # type: ignore
         r = Route('PATCH', f'/webhooks/{self.application_id}/{self.token}/messages/@original')
-        message_data = await self.client.http.request(r, form=form, files=files)
+        message_data = await self._send(r, 'http.edit', payload, form, fs)
         message_id = int(message_data['id'])
         if view is not MISSING and view is not None:
             self.client._connection.store_view(view, message_id)
@@ -132,7 +206,7 @@ class Adapter:
 
     async def delete_response(self):
         r = Route('DELETE', f'/webhooks/{self.application_id}/{self.token}/messages/@original')
-        await self.client.http.request(r)
+        await self._request(r, 'http.delete')
 
     async def patch_followup(
             self,
@@ -147,16 +221,13 @@ class Adapter:
             view: Optional[discord.ui.View] = MISSING,
             views: Optional[List[discord.ui.View]] = MISSING,
     ):
-        payload, form = _handle_edit_params(
+        payload, form, fs = _handle_edit_params(
             content=content, file=file, files=files, embed=embed,
             embeds=embeds, view=view, views=views, allowed_mentions=allowed_mentions)
 
         payload['wait'] = True
-        data = {'name': 'payload_json', 'value': json.dumps(payload)}
-
-        form.insert(0, data)  # type: ignore
         route = Route('PATCH', f'/webhooks/{self.application_id}/{self.token}/messages/{message_id}')
-        message_data = await self.client.http.request(route, form=form, files=files)
+        message_data = await self._send(route, 'http.edit', payload, form, fs)
         if view is not MISSING and view is not None:
             self._parent.client._connection.store_view(view, message_id)
         elif views is not MISSING and views is not None:
@@ -166,4 +237,4 @@ class Adapter:
 
     async def delete_followup_message(self, message_id: int):
         r = Route('DELETE', f'/webhooks/{self.application_id}/{self.token}/messages/{message_id}')
-        await self.client.http.request(r)
+        await self._request(r, 'http.delete')
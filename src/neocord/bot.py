@@ -2,22 +2,41 @@ from __future__ import annotations
 import sys
 import time
 import asyncio
+import logging
 import traceback
+from contextvars import ContextVar
 from .cog import Cog
 from .https import *
 from .errors import *
 from .context import Context
-from .enums import CommandType
+from .enums import CommandType, OverflowPolicy
+from .scheduler import Scheduler
+from .metrics import Metrics
+from .cache import TTLCache
+from .modal import MODAL_ID_SEPARATOR
+from .manifest import CommandManifest, command_key, payload_hash
+from .profiler import Profiler
+from .lane import InteractionLane
+from .utils import JSONEncoder, _to_json
 from .mod import ModerationRule
 from discord.ext import commands
 from .core import ApplicationCommand
+from .registry import CommandRegistry
+from dataclasses import replace
+from types import MappingProxyType
+from .routing import Endpoint, RouteKey, _compile_routes
 from discord.enums import InteractionType
-from typing import Callable, Optional, Any, Union, List, Dict
-from .parser import _build_prams, _build_ctx_menu_param, _build_modal_prams, _build_autocomplete_prams
+from typing import Callable, Optional, Any, Union, List, Dict, Mapping, Set, Coroutine, Tuple, Pattern, Iterable, ValuesView
+from .parser import Binder, _build_ctx_menu_param
 
 
 __all__ = ['Bot']
 
+_log = logging.getLogger(__name__)
+
+# the tracked task the current coroutine runs in, if any
+_owner_task: ContextVar[Optional[asyncio.Task]] = ContextVar('_owner_task', default=None)
+
 
 async def _supress_tree_error(interaction: any, error: Any):
     pass
@@ -31,6 +50,28 @@ class Bot(commands.Bot):
             intents: discord.Intents = None,
             help_command: Optional[commands.HelpCommand] = None,
             description: Optional[str] = None,
+            *,
+            max_concurrency: Optional[int] = None,
+            command_concurrency: Optional[int] = None,
+            guild_concurrency: Optional[int] = None,
+            max_queue: Optional[int] = None,
+            overflow: OverflowPolicy = OverflowPolicy.WAIT,
+            drain_timeout: float = 10.0,
+            enable_metrics: bool = True,
+            profile_rate: float = 0.0,
+            profile_dir: str = 'profiles',
+            modal_ttl: float = 900.0,
+            max_modals: int = 10000,
+            max_cached_checks: int = 10000,
+            bulk_sync: bool = False,
+            diff_sync: bool = False,
+            command_manifest: Optional[str] = None,
+            warm_start: bool = False,
+            sync_concurrency: int = 8,
+            json_encoder: Optional[JSONEncoder] = None,
+            interaction_lane: bool = False,
+            interaction_connections: int = 100,
+            interaction_keepalive: float = 60.0,
             **options
     ):
         super().__init__(
@@ -41,131 +82,315 @@ class Bot(commands.Bot):
             **options
         )
         self._queue = {}
-        self._modals = {}
-        self._checks = {}
-        self._origins = {}
-        self._automatics = {}
-        self.__after_invoke_jobs = {}
-        self.__before_invoke_jobs = {}
+        self._modals = TTLCache(max_modals, modal_ttl)
+        self._check_cache = TTLCache(max_cached_checks, 60.0)
+        self._modal_prefixes: Dict[str, Tuple[Any, Callable, Binder]] = {}
+        self._modal_patterns: List[Tuple[Pattern, Any, Callable, Binder]] = []
+        self._routes: Mapping[RouteKey, Endpoint] = MappingProxyType({})
+        self._tasks: Set[asyncio.Task] = set()
+        self._verify_task: Optional[asyncio.Task] = None
+        self._accepting = True
+        self.drain_timeout = drain_timeout
+        self.bulk_sync = bulk_sync
+        self.diff_sync = diff_sync
+        self.command_manifest = command_manifest
+        self.warm_start = warm_start
+        if sync_concurrency < 1:
+            raise ValueError('sync_concurrency must be at least 1')
+        self.sync_concurrency = sync_concurrency
+        self.json_encoder: JSONEncoder = json_encoder or _to_json
+        self.interaction_http: Optional[InteractionLane] = InteractionLane(
+            self, max_connections=interaction_connections, keepalive_timeout=interaction_keepalive,
+        ) if interaction_lane else None
+        self.metrics: Optional[Metrics] = Metrics() if enable_metrics else None
+        self.profile_rate = profile_rate
+        self.profiler = Profiler(profile_dir)
         self.tree.error(_supress_tree_error)
-        self._application_commands: Dict[int, ApplicationCommand] = {}
+        self.scheduler = Scheduler(
+            max_concurrency=max_concurrency,
+            command_concurrency=command_concurrency,
+            guild_concurrency=guild_concurrency,
+            max_queue=max_queue,
+            overflow=overflow,
+            spawn=self._spawn,
+        )
+        self._application_commands = CommandRegistry()
+
+    @property
+    def application_commands(self) -> ValuesView[ApplicationCommand]:
+        """
+        Returns a view of all the application commands from cache
+        """
+        return self._application_commands.values()
+
+    def guild_application_commands(self, guild_id: Optional[int]) -> Mapping[int, ApplicationCommand]:
+        """
+        Returns a read only view of the cached commands of a guild keyed by id,
+        None gives the global commands
+        """
+        return self._application_commands.scope(guild_id)
+
+    def find_application_command(
+            self, name: str, *, type: CommandType = CommandType.SLASH, guild_id: Optional[int] = None
+    ) -> Optional[ApplicationCommand]:
+        """
+        Returns a cached command by its name and type in a guild, or a global one if no guild is given
+        """
+        return self._application_commands.find(name, type, guild_id)
 
     @property
-    def application_commands(self) -> List[ApplicationCommand]:
+    def in_flight(self) -> int:
+        """
+        Returns the number of handler, hook and listener tasks still running
+        """
+        return len(self._tasks)
+
+    def command_metrics(self, name: Optional[str] = None) -> Dict[str, Any]:
         """
-        Returns a list of all the application commands from cache
+        Returns the recorded metrics of a command by its qualified name
+        or of every command if no name is given
         """
-        return list(self._application_commands.values())  # type: ignore # linter gone nuts
+        if self.metrics is None:
+            return {}
+        return self.metrics.snapshot(name)
+
+    def modal_stats(self) -> Dict[str, int]:
+        """
+        Returns the size and eviction counters of the pending modal callback registry
+        """
+        return self._modals.stats()
+
+    def invalidate_checks(
+            self,
+            *,
+            user_id: Optional[int] = None,
+            guild_id: Optional[int] = None,
+            command_id: Optional[int] = None,
+    ) -> int:
+        """
+        Drops cached check results matching every given filter,
+        with no filters the whole cache is cleared.
+        Returns the number of dropped results.
+        """
+        if user_id is None and guild_id is None and command_id is None:
+            count = len(self._check_cache)
+            self._check_cache.clear()
+            return count
+        return self._check_cache.invalidate(
+            lambda key: (user_id is None or key[0] == user_id)
+            and (guild_id is None or key[1] == guild_id)
+            and (command_id is None or key[2] == command_id)
+        )
+
+    @staticmethod
+    async def _tracked(coro: Coroutine) -> Any:
+        # handlers gathered inside the task inherit this, so drain can tell who is calling it
+        _owner_task.set(asyncio.current_task())
+        return await coro
+
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        task = self.loop.create_task(self._tracked(coro))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def drain(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for in-flight handler tasks to finish and cancels
+        whatever is still running once the timeout runs out.
+        The scheduler is closed first, queued invocations are dropped and no new ones are started.
+        When called from a handler, the task running it is neither waited on nor cancelled.
+        """
+        self.scheduler.close()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self.drain_timeout if timeout is None else timeout)
+        caller = {asyncio.current_task(), _owner_task.get()}
+        while self._tasks - caller:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.wait(self._tasks - caller, timeout=remaining)
+        leftover = self._tasks - caller
+        for task in leftover:
+            task.cancel()
+        if leftover:
+            await asyncio.gather(*leftover, return_exceptions=True)
+
+    @staticmethod
+    def _split_options(options: Dict[str, Any]):
+        main_options = {}
+        sub_options = {}
+        for name, option in options.items():
+            if name.startswith('*'):
+                sub_options = option
+            else:
+                main_options[name] = option
+        return main_options, sub_options
+
+    def _report_error(self, cog: Any, c: Context, error: Exception):
+        error_handler = self._connection.hooks.get('on_app_command_error')
+        if error_handler:
+            self._spawn(error_handler(cog, c, error))
+        else:
+            print(f'Ignoring exception while invoking application command `{c!r}`\n', file=sys.stderr)
+            traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
+
+    async def _run_handlers(self, cog: Any, c: Context, *coros, profile_rate: Optional[float] = None):
+        rate = self.profile_rate if profile_rate is None else profile_rate
+        sample = self.profiler.sample(c.qualified_name, rate) if rate else None
+        if sample is not None:
+            coros = [sample.wrap(coro) for coro in coros]
+        started = time.perf_counter()
+        results = await asyncio.gather(*coros, return_exceptions=True)
+        finished = time.perf_counter()
+        c.time_taken = finished - c._received_at
+        name = c.qualified_name
+        if self.metrics is not None:
+            self.metrics.observe(name, 'handler', finished - started)
+            self.metrics.observe(name, 'total', c.time_taken)
+        for result in results:
+            if isinstance(result, Exception):
+                if self.metrics is not None:
+                    self.metrics.failed(name)
+                self._report_error(cog, c, result)
+
+    @staticmethod
+    async def _run_autocomplete(endpoint: Endpoint, c: Context, key: tuple, *args, **kwargs):
+        await endpoint.autocomplete(c, *args, **kwargs)
+        if c._sent_choices is not None:
+            endpoint.autocomplete_cache.set(key, c._sent_choices)
 
     async def _handle_interaction(self, interaction: discord.Interaction):
 
+        if not self._accepting:
+            return
+
         if interaction.type is InteractionType.autocomplete:
             c = Context(interaction)
-            qualified_name = c.command.qualified_name
-            try:
-                self._origins[c.command.id]
-            except KeyError:
+            endpoint = self._routes.get(c._route_key)
+            if endpoint is None or endpoint.autocomplete is None:
                 raise CommandNotImplemented(f'Application Command `{c!r}` (ID: {c.id}) is not implemented.')
-            args, kwargs = _build_autocomplete_prams(c._parsed_options, auto)
-            self.loop.create_task(self._automatics[c.command.id](c, *args, **kwargs))
+            main_options, sub_options = self._split_options(c._parsed_options)
+            options = sub_options if endpoint.subhandler else main_options
+            cache = endpoint.autocomplete_cache
+            if cache is not None:
+                focused = next((option for option in options.values() if option.focused), None)
+                key = c._route_key + (focused and focused.name, focused and focused.data.get('value'))
+                choices = cache.get(key)
+                if choices is not None:
+                    self._spawn(c.send_automated_choices(choices))
+                    return
+            args, kwargs = endpoint.autocomplete_binder(options)
+            if cache is not None:
+                self._spawn(self._run_autocomplete(endpoint, c, key, *args, **kwargs))
+            else:
+                self._spawn(endpoint.autocomplete(c, *args, **kwargs))
 
         if interaction.type is InteractionType.modal_submit:
             m = Context(interaction)
-            target = interaction.data['custom_id']
-            if target in self._modals:
-                callback = self._modals.pop(target)
-                args, kwargs = _build_modal_prams(m._modal_values, callback)
+            custom_id = interaction.data['custom_id']
+            # stateless modals are routed below and must not count as registry misses
+            entry = self._modals.pop(custom_id) if custom_id in self._modals else None
+            if entry is not None:
+                callback, binder = entry
+                args, kwargs = binder(m._modal_values)
                 await callback(m, *args, **kwargs)
+                return
+            prefix, _, state = custom_id.partition(MODAL_ID_SEPARATOR)
+            route = self._modal_prefixes.get(prefix)
+            if route is not None:
+                m.modal_state = tuple(state.split(MODAL_ID_SEPARATOR)) if state else ()
+            else:
+                for pattern, *handler in self._modal_patterns:
+                    match = pattern.match(custom_id)
+                    if match:
+                        m.modal_state = match.groups()
+                        route = handler
+                        break
+            if route is not None:
+                cog, handler, binder = route
+                args, kwargs = binder(m._modal_values)
+                await handler(cog, m, *args, **kwargs)
 
         if interaction.type == InteractionType.application_command:
             c = Context(interaction)
-            try:
-                cog = self._origins[c.command.id]
-            except (KeyError, AttributeError):
+            endpoint = self._routes.get(c._route_key)
+            if endpoint is None:
                 print(
                     f'WARNING: Application command `{c!r}` (ID: {c.id}) is not implemented',
                     file=sys.stderr)
-            else:
-                try:
-                    cog = self._origins[c.command.id]
-
-                    if c.type is CommandType.USER:
-                        h = self._connection.hooks[str(c.command.id)]
-                        return await h(cog, c, c._target_user)
-
-                    if c.type is CommandType.MESSAGE:
-                        h = self._connection.hooks[str(c.command.id)]
-                        return await h(cog, c, c._target_message)
-
-                    options = c._parsed_options
-                    main_handler = self._connection.hooks[str(c.command.id)]
-                    check = self._checks.get(c.command.id)
-                    on_invoke = self._connection.hooks.get('on_app_command')
-                    before_invoke_job = self.__before_invoke_jobs.get(c.command.id)
-                    after_invoke_job = self.__after_invoke_jobs.get(c.command.id)
-
-                    if on_invoke:
-                        self.loop.create_task(on_invoke(cog, c))
-                    if check is not None:
+                return
+            cog = endpoint.cog
+            if self.metrics is not None:
+                self.metrics.invoked(c.qualified_name)
+            try:
+                if endpoint.cooldown is not None:
+                    retry_after = endpoint.cooldown.update_rate_limit(c)
+                    if retry_after:
+                        raise CommandOnCooldown(
+                            f'Application command `{c!r}` is on cooldown. Retry in {retry_after:.2f}s', retry_after)
+
+                if c.type is CommandType.USER or c.type is CommandType.MESSAGE:
+                    target = c._target_user if c.type is CommandType.USER else c._target_message
+                    await self.scheduler.submit(
+                        c, lambda: self._run_handlers(
+                            cog, c, endpoint.handler(cog, c, target), profile_rate=endpoint.profile_rate),
+                        command_id=c.id, limit=endpoint.concurrency)
+                    return
+
+                on_invoke = self._connection.hooks.get('on_app_command')
+                if on_invoke:
+                    self._spawn(on_invoke(cog, c))
+
+                check = endpoint.check
+                if check is not None:
+                    key = (c.author.id, interaction.guild_id, c.id)
+                    done = self._check_cache.get(key) if endpoint.check_ttl else None
+                    if done is None:
+                        started = time.perf_counter()
                         try:
                             done = await check(c)
                         except Exception as e:
                             raise CheckFailure(f'Check `{check.__name__}` raised an exception: ({e})')
-                        else:
-                            if type(done) is not bool:
-                                raise CheckFailure(f'Check `{check.__name__}` should return a boolean.')
-                            if done:
-                                if before_invoke_job:
-                                    self.loop.create_task(before_invoke_job(c))
-
-                                main_options = {k: v for k, v in options.items() if not k.startswith("*")}
-                                args, kwargs = _build_prams(main_options, main_handler)
-                                self.loop.create_task(main_handler(cog, c, *args, **kwargs))
-
-                                for name, option in options.items():
-                                    if name.startswith('*'):
-                                        handler = self._connection.hooks.get(f'{c.command.id}{name}')
-                                        if handler:
-                                            args, kwargs = _build_prams(option, handler)
-                                            self.loop.create_task(handler(cog, c, *args, **kwargs))
-                                    elif name.startswith('**'):
-                                        handler = self._connection.hooks.get(f'{c.command.id}{name}')
-                                        if handler:
-                                            args, kwargs = _build_prams(option, handler)
-                                            self.loop.create_task(handler(cog, c, *args, **kwargs))
-                    else:
-                        if before_invoke_job:
-                            self.loop.create_task(before_invoke_job(c))
-
-                        main_options = {k: v for k, v in options.items() if not k.startswith("*")}
-                        args, kwargs = _build_prams(main_options, main_handler)
-                        self.loop.create_task(main_handler(cog, c, *args, **kwargs))
-
-                        for name, option in options.items():
-                            if name.startswith('*'):
-                                handler = self._connection.hooks.get(f'{c.command.id}{name}')
-                                if handler:
-                                    args, kwargs = _build_prams(option, handler)
-                                    self.loop.create_task(handler(cog, c, *args, **kwargs))
-                            elif name.startswith('**'):
-                                handler = self._connection.hooks.get(f'{c.command.id}{name}')
-                                if handler:
-                                    args, kwargs = _build_prams(option, handler)
-                                    self.loop.create_task(handler(cog, c, *args, **kwargs))
-
-                except Exception as e:
-                    error_handler = self._connection.hooks.get('on_app_command_error')
-                    if error_handler:
-                        self.loop.create_task(error_handler(cog, c, e))
-                    else:
-                        print(f'Ignoring exception while invoking application command `{c!r}`\n', file=sys.stderr)
-                        traceback.print_exception(type(e), e, e.__traceback__, file=sys.stderr)
+                        finally:
+                            if self.metrics is not None:
+                                self.metrics.observe(c.qualified_name, 'check', time.perf_counter() - started)
+                        if type(done) is not bool:
+                            raise CheckFailure(f'Check `{check.__name__}` should return a boolean.')
+                        if endpoint.check_ttl:
+                            self._check_cache.set(key, done, endpoint.check_ttl)
                 else:
-                    if after_invoke_job:
-                        self.loop.create_task(after_invoke_job(c))
-                    on_completion = self._connection.hooks.get('on_app_command_completion')
-                    if on_completion:
-                        self.loop.create_task(on_completion(cog, c))
+                    done = True
+
+                if done:
+                    if endpoint.before_invoke:
+                        self._spawn(endpoint.before_invoke(c))
+
+                    main_options, sub_options = self._split_options(c._parsed_options)
+                    args, kwargs = endpoint.binder(main_options)
+                    if endpoint.subhandler:
+                        sub_args, sub_kwargs = endpoint.subbinder(sub_options)
+
+                    def invoke():
+                        coros = [endpoint.handler(cog, c, *args, **kwargs)]
+                        if endpoint.subhandler:
+                            coros.append(endpoint.subhandler(cog, c, *sub_args, **sub_kwargs))
+                        return self._run_handlers(cog, c, *coros, profile_rate=endpoint.profile_rate)
+
+                    if not await self.scheduler.submit(c, invoke, command_id=c.id, limit=endpoint.concurrency):
+                        # rejected, the handler never ran
+                        return
+
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.failed(c.qualified_name)
+                self._report_error(cog, c, e)
+            else:
+                if endpoint.after_invoke:
+                    self._spawn(endpoint.after_invoke(c))
+                on_completion = self._connection.hooks.get('on_app_command_completion')
+                if on_completion:
+                    self._spawn(on_completion(cog, c))
 
     async def _walk_app_commands(self, cog: Cog):
 
@@ -175,85 +400,281 @@ class Bot(commands.Bot):
             else:
                 raise NonCoroutine(f'Listener `{name}` must be a coroutine function')
 
+        for route, handler in cog.__modal_handlers__.items():
+            if not asyncio.iscoroutinefunction(handler):
+                raise NonCoroutine(f'Modal handler `{handler.__name__}` must be a coroutine function')
+            binder = Binder(handler, skip=2, unwrap=False)
+            if isinstance(route, str):
+                self._modal_prefixes[route] = cog.cls, handler, binder
+            else:
+                self._modal_patterns.append((route, cog.cls, handler, binder))
+
         for custom_id, struct in cog.__container__.items():
             cmd = struct['command']['object']
             check = struct['command']['check']
+            check_ttl = struct['command']['check_ttl']
             subcommands = struct['subcommands']
             method = struct['command']['method']
             groups = struct['groups']
-            guild_id = struct['command']['guild_id']
+            guild_ids = struct['command']['guild_ids']
             auto = struct['command']['autocompletes']
+            auto_cache = struct['command']['autocomplete_cache']
             after_invoke = struct['command']['after_invoke']
             before_invoke = struct['command']['before_invoke']
+            concurrency = struct['command']['concurrency']
+            cooldown = struct['command']['cooldown']
+            profile_rate = struct['command']['profile_rate']
 
             if not asyncio.iscoroutinefunction(method):
                 raise NonCoroutine(f'Application command handler `{method.__name__}` must be a coroutine function')
 
-            if auto:
-                if not asyncio.iscoroutinefunction(auto):
-                    raise NonCoroutine(f'Autocomplete function `{auto.__name__}` must be a coroutine.')
-                self._automatics[custom_id] = auto
-
-            if check:
-                if not asyncio.iscoroutinefunction(check):
-                    raise NonCoroutine(f'Check function `{check.__name__}` must be a coroutine.')
-                self._checks[custom_id] = check
-
-            if before_invoke:
-                if not asyncio.iscoroutinefunction(before_invoke):
-                    raise NonCoroutine(f'Before invoke function `{before_invoke.__name__}` must be a coroutine.')
-                self.__before_invoke_jobs[custom_id] = before_invoke
-
-            if after_invoke:
-                if not asyncio.iscoroutinefunction(after_invoke):
-                    raise NonCoroutine(f'After invoke function `{after_invoke.__name__}` must be a coroutine.')
-                self.__after_invoke_jobs[custom_id] = after_invoke
+            if auto and not asyncio.iscoroutinefunction(auto):
+                raise NonCoroutine(f'Autocomplete function `{auto.__name__}` must be a coroutine.')
+
+            if check and not asyncio.iscoroutinefunction(check):
+                raise NonCoroutine(f'Check function `{check.__name__}` must be a coroutine.')
+
+            if before_invoke and not asyncio.iscoroutinefunction(before_invoke):
+                raise NonCoroutine(f'Before invoke function `{before_invoke.__name__}` must be a coroutine.')
+
+            if after_invoke and not asyncio.iscoroutinefunction(after_invoke):
+                raise NonCoroutine(f'After invoke function `{after_invoke.__name__}` must be a coroutine.')
+
+            root = Endpoint(
+                cog=cog.cls,
+                handler=method,
+                binder=Binder(method, skip=2),
+                check=check,
+                check_ttl=check_ttl,
+                before_invoke=before_invoke,
+                after_invoke=after_invoke,
+                autocomplete=auto,
+                autocomplete_binder=Binder(auto, skip=1) if auto else None,
+                autocomplete_cache=auto_cache,
+                concurrency=concurrency,
+                cooldown=cooldown,
+                profile_rate=profile_rate,
+            )
+            routes = {(None, None): root}
 
-            sub_map = {}
             if subcommands:
                 for name, data in subcommands.items():
                     cmd._inject_subcommand(data['object'])
                     meth = data['method']
                     if not asyncio.iscoroutinefunction(meth):
                         raise NonCoroutine(f'Subcommand method `{meth.__name__}` must be a coroutine.')
-                    sub_map[f'{custom_id}*{name}'] = meth
+                    routes[(None, name)] = replace(root, subhandler=meth, subbinder=Binder(meth, skip=2))
 
-            group_map = {}
             if groups:
                 for group_name, data in groups.items():
                     group = data['object']
                     for sub_name, val in data['subcommands'].items():
                         group._inject_subcommand(val['object'])
-                        group_map[f'{custom_id}${group_name}**{sub_name}'] = val['method']
+                        meth = val['method']
+                        routes[(group_name, sub_name)] = replace(
+                            root, subhandler=meth, subbinder=Binder(meth, skip=2))
                     cmd._inject_group(group)
 
-            self._origins[custom_id] = cog.cls
-            self._queue[custom_id] = cmd, guild_id, method, sub_map, group_map
+            self._queue[custom_id] = cmd, guild_ids, routes
 
     async def add_application_cog(self, cog: Cog) -> None:
         await self._walk_app_commands(cog)
 
-    async def sync_current_commands(self) -> None:
-        for map_hash, value in self._queue.items():
-            command, guild_id, method, subcommands, groups = value
-            data = await post_command(self, command, guild_id)
-            command_id = int(data['id'])
-            self._connection.hooks[str(command_id)] = method
-            self._connection.hooks.pop(map_hash, None)
-
-            for alias, handler in subcommands.items():
-                hook_name = str(command_id) + '*' + alias.split('*')[-1]
-                self._connection.hooks[hook_name] = handler
-
-            for alias, handler in groups.items():
-                hook_name = str(command_id) + '**' + alias.split('$')[-1]
-                self._connection.hooks[hook_name] = handler
-
-            self._checks[command_id] = self._checks.pop(map_hash, None)
-            self.__before_invoke_jobs[command_id] = self.__before_invoke_jobs.pop(map_hash, None)
-            self.__after_invoke_jobs[command_id] = self.__after_invoke_jobs.pop(map_hash, None)
-            self._origins[command_id] = self._origins.pop(map_hash, None)
-            self._application_commands[command_id] = ApplicationCommand(self, data)
+    def _scoped_queue(self) -> Dict[Optional[int], list]:
+        scopes: Dict[Optional[int], list] = {}
+        for command, guild_ids, routes in self._queue.values():
+            for guild_id in guild_ids:
+                scopes.setdefault(guild_id, []).append((command, routes))
+        return scopes
+
+    async def _for_scopes(self, scopes: Iterable[Optional[int]], func: Callable) -> Dict[int, Exception]:
+        # the global scope runs first, guild scopes run concurrently since every guild has its own
+        # rate limit bucket, discord.py still waits out the bucket and global limits per request
+        scopes = list(scopes)
+        if None in scopes:
+            scopes.remove(None)
+            await func(None)
+        semaphore = asyncio.Semaphore(self.sync_concurrency)
+        failures: Dict[int, Exception] = {}
+
+        async def run(guild_id: int):
+            async with semaphore:
+                try:
+                    await func(guild_id)
+                except Exception as e:
+                    failures[guild_id] = e
+                    _log.warning('Application command sync failed for guild %s: %r', guild_id, e)
+
+        await asyncio.gather(*(run(guild_id) for guild_id in scopes))
+        return failures
+
+    def _save_manifest(self, registered: Dict[Optional[int], List[Dict[str, Any]]]):
+        # keeps the manifest current whatever the sync mode, so warm start can use it on the next boot
+        if not self.command_manifest:
+            return
+        manifest = CommandManifest.load(self.command_manifest)
+        if manifest.application_id != self.application_id:
+            manifest = CommandManifest(self.command_manifest)
+        for guild_id, payloads in registered.items():
+            manifest.record(guild_id, payloads)
+        manifest.application_id = self.application_id
+        manifest.save()
+
+    async def _sync_each(self, compiled: dict) -> Dict[int, Exception]:
+        scopes = self._scoped_queue()
+        synced: Dict[Optional[int], List[Dict[str, Any]]] = {}
+
+        async def sync_scope(guild_id: Optional[int]):
+            registered = []
+            for command, routes in scopes[guild_id]:
+                data = await post_command(self, command, guild_id)
+                command_id = int(data['id'])
+                compiled[command_id] = routes
+                self._application_commands[command_id] = ApplicationCommand(self, data)
+                registered.append(data)
+            synced[guild_id] = registered
+
+        failures = await self._for_scopes(scopes, sync_scope)
+        self._save_manifest(synced)
+        return failures
+
+    async def _sync_bulk(self, compiled: dict) -> Dict[int, Exception]:
+        scopes = self._scoped_queue()
+        synced: Dict[Optional[int], List[Dict[str, Any]]] = {}
+
+        async def sync_scope(guild_id: Optional[int]):
+            entries = scopes[guild_id]
+            payloads = await put_commands(self, [command for command, _ in entries], guild_id)
+            synced[guild_id] = payloads
+            registered = {command_key(data): data for data in payloads}
+            self._application_commands.drop_scope(guild_id)
+            for command, routes in entries:
+                data = registered[command_key(command.to_dict())]
+                command_id = int(data['id'])
+                compiled[command_id] = routes
+                self._application_commands[command_id] = ApplicationCommand(self, data)
+
+        failures = await self._for_scopes(scopes, sync_scope)
+        self._save_manifest(synced)
+        return failures
+
+    async def _sync_diff(self, compiled: dict, *, trust_manifest: bool = True) -> Dict[int, Exception]:
+        manifest = CommandManifest.load(self.command_manifest) if self.command_manifest else None
+        # a manifest written for another application (or never written) can not be trusted
+        trusted = trust_manifest and manifest is not None and manifest.application_id == self.application_id
+        scopes = self._scoped_queue()
+        guild_ids = set(scopes) | {None}
+        if trusted:
+            guild_ids.update(manifest.guild_ids)
+        created, updated, deleted, unchanged = [], [], [], []
+
+        async def sync_scope(guild_id: Optional[int]):
+            if trusted:
+                known = manifest.scope(guild_id)
+            elif guild_id is None:
+                known = {command_key(data): data for data in await fetch_global_commands(self)}
+            else:
+                known = {command_key(data): data for data in await fetch_guild_commands(self, guild_id)}
+
+            registered = []
+            for command, routes in scopes.get(guild_id, []):
+                payload = command.to_dict()
+                remote = known.pop(command_key(payload), None)
+                if remote is None:
+                    data = await post_command(self, command, guild_id)
+                    created.append(payload['name'])
+                elif payload_hash(remote, guild_id) != payload_hash(payload, guild_id):
+                    data = await patch_existing_command(self, ApplicationCommand(self, remote), command)
+                    updated.append(payload['name'])
+                else:
+                    data = remote
+                    unchanged.append(payload['name'])
+                command_id = int(data['id'])
+                compiled[command_id] = routes
+                self._application_commands[command_id] = ApplicationCommand(self, data)
+                registered.append(data)
+
+            for data in known.values():
+                try:
+                    await delete_command(self, int(data['id']), guild_id)
+                except discord.NotFound:
+                    pass
+                self._application_commands.pop(int(data['id']), None)
+                deleted.append(data['name'])
+
+            if manifest is not None:
+                manifest.record(guild_id, registered)
+
+        failures = await self._for_scopes(guild_ids, sync_scope)
+
+        if manifest is not None:
+            manifest.application_id = self.application_id
+            manifest.save()
+
+        _log.info(
+            'Application command sync: %d created %s, %d updated %s, %d deleted %s, %d unchanged, %d guilds failed',
+            len(created), created, len(updated), updated, len(deleted), deleted, len(unchanged), len(failures))
+        return failures
+
+    def _warm_start(self) -> bool:
+        manifest = CommandManifest.load(self.command_manifest)
+        if manifest.application_id is None:
+            return False
+        if self.application_id is not None and self.application_id != manifest.application_id:
+            return False
+        compiled = {}
+        for guild_id, entries in self._scoped_queue().items():
+            hashes = manifest.hashes(guild_id)
+            known = manifest.scope(guild_id)
+            for command, routes in entries:
+                payload = command.to_dict()
+                key = command_key(payload)
+                if hashes.get(key) != payload_hash(payload, guild_id):
+                    return False
+                compiled[int(known[key]['id'])] = routes
+        for guild_id in manifest.guild_ids:
+            for data in manifest.scope(guild_id).values():
+                command = ApplicationCommand(self, data)
+                self._application_commands[command.id] = command
+        self._connection.application_id = manifest.application_id
+        self._routes = _compile_routes(self._routes, compiled)
+        return True
+
+    async def _verify_commands(self):
+        await self.wait_until_ready()
+        try:
+            # the untrusted diff fetches the global commands itself
+            compiled = {}
+            failures = await self._sync_diff(compiled, trust_manifest=False)
+            self._routes = _compile_routes(self._routes, compiled)
+            if failures:
+                _log.warning('Background verification failed for guilds %s', sorted(failures))
+        except Exception:
+            _log.exception('Background verification of application commands failed')
+
+    async def sync_current_commands(
+            self, *, bulk: Optional[bool] = None, diff: Optional[bool] = None
+    ) -> Dict[int, Exception]:
+        """
+        Registers the queued application commands and builds their routes.
+        Guild scopes are registered concurrently, at most `sync_concurrency` at a time,
+        and a failing guild does not stop the others.
+        Returns the errors of the failed guilds keyed by guild id.
+        In bulk mode each scope (global or a guild) is registered with a single
+        overwrite request, which also removes commands of that scope that are not queued.
+        In diff mode only new, changed and removed commands are sent, compared against
+        the registered commands or against the command manifest if the bot has one.
+        Every mode rewrites the command manifest of the synced scopes when the bot has one.
+        """
+        compiled = {}
+        if self.diff_sync if diff is None else diff:
+            failures = await self._sync_diff(compiled)
+        elif self.bulk_sync if bulk is None else bulk:
+            failures = await self._sync_bulk(compiled)
+        else:
+            failures = await self._sync_each(compiled)
+        self._routes = _compile_routes(self._routes, compiled)
+        return failures
 
     async def sync_global_commands(self) -> None:
         payloads = await fetch_global_commands(self)
@@ -261,11 +682,18 @@ class Bot(commands.Bot):
             command = ApplicationCommand(self, data)
             self._application_commands[command.id] = command
 
-    async def sync_for(self, guild: discord.Guild) -> None:
-        cmd_ls = await fetch_guild_commands(self, guild.id)
-        for cmd in cmd_ls:
-            command = ApplicationCommand(self, cmd)
-            self._application_commands[command.id] = command
+    async def sync_for(self, *guilds: discord.Guild) -> Dict[int, Exception]:
+        """
+        Fetches the application commands of the given guilds into the cache,
+        at most `sync_concurrency` guilds at a time.
+        Returns the errors of the failed guilds keyed by guild id.
+        """
+        async def fetch(guild_id: int):
+            for data in await fetch_guild_commands(self, guild_id):
+                command = ApplicationCommand(self, data)
+                self._application_commands[command.id] = command
+
+        return await self._for_scopes({guild.id for guild in guilds}, fetch)
 
     async def fetch_command(self, command_id: int, guild_id: int = None) -> ApplicationCommand:
         data = await fetch_any_command(self, command_id, guild_id)
@@ -280,8 +708,25 @@ class Bot(commands.Bot):
     async def start(self, token: str, *, reconnect: bool = True) -> None:
         self.add_listener(self._handle_interaction, 'on_interaction')
         await self.login(token)
-        app = await self.application_info()
-        self._connection.application_id = app.id
-        await self.sync_global_commands()
-        await self.sync_current_commands()
+        if self.warm_start and self.command_manifest and self._warm_start():
+            # commands are unchanged since the manifest was written, check with the API once connected
+            # kept out of the tracked tasks so close does not wait on it
+            self._verify_task = self.loop.create_task(self._verify_commands())
+        else:
+            if self._connection.application_id is None:
+                app = await self.application_info()
+                self._connection.application_id = app.id
+            await self.sync_global_commands()
+            await self.sync_current_commands()
         await self.connect(reconnect=reconnect)
+
+    async def close(self) -> None:
+        self._accepting = False
+        if self._verify_task is not None and not self._verify_task.done():
+            self._verify_task.cancel()
+            await asyncio.gather(self._verify_task, return_exceptions=True)
+        await self.drain()
+        self.profiler.flush()
+        if self.interaction_http is not None:
+            await self.interaction_http.close()
+        await super().close()
@@ -2,11 +2,15 @@ import asyncio
 import discord
 from functools import wraps
 from .utils import CommandType
+from .enums import BucketType
+from .cooldown import Cooldown
+from .cache import TTLCache
 from .errors import NonCoroutine
 from .input_user import UserCommand
 from .input_msg import MessageCommand
 from .origin import ApplicationCommandOrigin
-from typing import Optional, ClassVar, Callable, List, Union, Dict, Any
+from .modal import MODAL_ID_SEPARATOR
+from typing import Optional, ClassVar, Callable, List, Union, Dict, Any, Pattern, Iterable, Tuple
 from .input_chat import SubCommand, Option, SlashCommand, SubCommandGroup
 
 
@@ -20,17 +24,33 @@ class Temp:
 T = Temp()
 
 
+def _guild_scopes(guild_id: Union[int, Iterable[int], None]) -> Tuple[Optional[int], ...]:
+    # None registers the command globally
+    if guild_id is None:
+        return None,
+    # snowflakes may be given as strings, only real collections list several guilds
+    if isinstance(guild_id, (int, str, bytes)) or not isinstance(guild_id, Iterable):
+        return int(guild_id),
+    scopes = tuple(dict.fromkeys(int(gid) for gid in guild_id))
+    if not scopes:
+        raise ValueError("At least one guild id is required")
+    return scopes
+
+
 class Cog(metaclass=type):
     _container: ClassVar[Dict[str, Any]] = {}
     _listeners: ClassVar[Dict[str, Any]] = {}
+    _modal_handlers: ClassVar[Dict[Union[str, Pattern], Any]] = {}
 
     def __new__(cls, *args, **kwargs):
         self = super().__new__(cls)
         self.__setattr__("cls", self)
         self.__setattr__("__container__", cls._container.copy())
         self.__setattr__("__listeners__", cls._listeners.copy())
+        self.__setattr__("__modal_handlers__", cls._modal_handlers.copy())
         cls._listeners.clear()
         cls._container.clear()
+        cls._modal_handlers.clear()
         return self
 
     @classmethod
@@ -38,7 +58,8 @@ class Cog(metaclass=type):
             cls,
             name: str, description: str = None, options: List[Option] = None,
             *,
-            dm_access: bool = True, category: CommandType = CommandType.SLASH, guild_id: int = None
+            dm_access: bool = True, category: CommandType = CommandType.SLASH,
+            guild_id: Union[int, Iterable[int]] = None
     ):
         if description and category is not CommandType.SLASH:
             raise ValueError("Description is only allowed for slash commands")
@@ -54,6 +75,8 @@ class Cog(metaclass=type):
         else:
             raise ValueError("Invalid command type")
 
+        guild_ids = _guild_scopes(guild_id)
+
         T.ROOT = command._custom_id
         T.GROUP = None
         T.SUBCOMMAND = None
@@ -68,10 +91,15 @@ class Cog(metaclass=type):
                     "object": command,
                     "method": wrapper(),
                     "check": None,
+                    "check_ttl": None,
                     "autocompletes": None,
+                    "autocomplete_cache": None,
                     "before_invoke": None,
                     "after_invoke": None,
-                    "guild_id": guild_id,
+                    "concurrency": None,
+                    "cooldown": None,
+                    "profile_rate": None,
+                    "guild_ids": guild_ids,
                 },
                 "subcommands": {},
                 "groups": {},
@@ -140,23 +168,38 @@ class Cog(metaclass=type):
         return decorator
 
     @classmethod
-    def auto_complete(cls, coro: Callable):
+    def auto_complete(cls, coro: Callable, *, cache_ttl: Optional[float] = None, cache_size: int = 1024):
+        """
+        Decorator for adding an autocomplete handler to the command.
+        If cache_ttl is given, the choices sent for a focused option and typed value
+        are cached and replayed without calling the handler again.
+        """
+        cache = TTLCache(cache_size, cache_ttl) if cache_ttl else None
 
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 cls._container[T.ROOT]["command"]["autocompletes"] = coro
+                cls._container[T.ROOT]["command"]["autocomplete_cache"] = cache
                 return cls
             return wrapper()
         return decorator
 
     @classmethod
-    def check(cls, coro: Callable):
+    def check(cls, coro: Callable, *, cache_ttl: Optional[float] = None):
+        """
+        Decorator for adding a check to the command.
+        If cache_ttl is given, the result is reused for the same user, guild and command
+        until it expires or is invalidated through the bot.
+        """
+        if cache_ttl is not None and cache_ttl <= 0:
+            raise ValueError("Check cache ttl must be greater than 0")
 
         def decorator(func):
             @wraps(func)
             def wrapper(*args, **kwargs):
                 cls._container[T.ROOT]["command"]["check"] = coro
+                cls._container[T.ROOT]["command"]["check_ttl"] = cache_ttl
                 return cls
             return wrapper()
         return decorator
@@ -183,6 +226,71 @@ class Cog(metaclass=type):
             return wrapper()
         return decorator
 
+    @classmethod
+    def max_concurrency(cls, limit: int):
+        """
+        Decorator for limiting how many invocations of the command can run at once
+        """
+        if limit < 1:
+            raise ValueError("Concurrency limit must be at least 1")
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cls._container[T.ROOT]["command"]["concurrency"] = limit
+                return cls
+            return wrapper()
+        return decorator
+
+    @classmethod
+    def cooldown(cls, rate: int, per: float, bucket: BucketType = BucketType.USER):
+        """
+        Decorator for limiting a command to `rate` uses every `per` seconds per bucket
+        """
+        cooldown = Cooldown(rate, per, bucket)
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cls._container[T.ROOT]["command"]["cooldown"] = cooldown
+                return cls
+            return wrapper()
+        return decorator
+
+    @classmethod
+    def profile(cls, rate: float):
+        """
+        Decorator for profiling a fraction (0 to 1) of the command invocations
+        """
+        if not 0 <= rate <= 1:
+            raise ValueError("Profile rate must be between 0 and 1")
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                cls._container[T.ROOT]["command"]["profile_rate"] = rate
+                return cls
+            return wrapper()
+        return decorator
+
+    @classmethod
+    def modal(cls, route: Union[str, Pattern]):
+        """
+        Decorator for handling submitted modals by custom_id instead of a per-modal callback.
+        A string routes every custom_id built with `modal_id(route, ...)`,
+        a compiled pattern routes every custom_id it matches.
+        """
+        if isinstance(route, str) and MODAL_ID_SEPARATOR in route:
+            raise ValueError(f"Modal route prefix can not contain `{MODAL_ID_SEPARATOR}`")
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return func
+            cls._modal_handlers[route] = wrapper()
+            return cls
+        return decorator
+
     @classmethod
     def listener(cls, coro: Callable):
         """
@@ -1,25 +1,53 @@
 from __future__ import annotations
+import time
 import asyncio
 import json
 import discord
 from discord.http import Route
-from discord.utils import MISSING
+from discord.utils import MISSING, cached_slot_property
 from discord.ext import commands
 from .modal import Modal
 from .adp import Adapter
+from .template import ResponseTemplate, RenderedResponse
 from .input_chat import Choice
 from .enums import CommandType, OptionType, try_enum, ComponentType
 from discord import Message, PartialMessage, MessageReference
-from .utils import _handle_edit_params, _handle_send_prams
+from .utils import _handle_edit_params, _handle_send_prams, FileLike
 from .core import InteractionData, SlashCommandOption, Resolved, ApplicationCommand, DummyOption
 from typing import Optional, Any, Union, Sequence, Iterable, NamedTuple, List, Dict, Tuple, Coroutine
 
 
 class Context:
+    __slots__ = (
+        '_deferred',
+        '_invisible',
+        '_auto_deferred',
+        'interaction',
+        '_received_at',
+        '_first_response_at',
+        '_sent_choices',
+        'modal_state',
+        'time_taken',
+        'original_message',
+        '_cs_adapter',
+        '_cs_type',
+        '_cs_data',
+        '_cs_modal_values',
+        '_cs_resolved',
+        '_cs_route_key',
+        '_cs_qualified_name',
+        '_cs_parsed_options',
+    )
+
     def __init__(self, interaction: discord.Interaction):
         self._deferred = False
         self._invisible = False
+        self._auto_deferred = False
         self.interaction = interaction
+        self._received_at = time.perf_counter()
+        self._first_response_at: Optional[float] = None
+        self._sent_choices: Optional[List[Dict[str, Any]]] = None
+        self.modal_state: Tuple[str, ...] = ()
         self.time_taken: Optional[float] = None
         self.original_message: Optional[discord.Message] = None
 
@@ -33,11 +61,19 @@ class Context:
         """
         return self.interaction.client
 
-    @property
-    def _adapter(self):
-        return Adapter(self.interaction)
+    @cached_slot_property('_cs_adapter')
+    def _adapter(self) -> Adapter:
+        return Adapter(self.interaction, metrics_key=self.qualified_name)
 
-    @property
+    def _mark_responded(self):
+        if self._first_response_at is None:
+            self._first_response_at = time.perf_counter()
+            metrics = getattr(self.client, 'metrics', None)
+            name = self.qualified_name
+            if metrics is not None and name is not None:
+                metrics.first_response(name, self._first_response_at - self._received_at)
+
+    @cached_slot_property('_cs_type')
     def type(self) -> CommandType:
         """
         Returns the type of the invoked application command
@@ -51,6 +87,21 @@ class Context:
         """
         return self.interaction.data['name']
 
+    @cached_slot_property('_cs_qualified_name')
+    def qualified_name(self) -> Optional[str]:
+        """
+        Returns the full name of the invoked command including its group and subcommand
+        """
+        name = self.interaction.data.get('name')
+        if name is None:
+            return None
+        _, group, subcommand = self._route_key
+        if subcommand is None:
+            return name
+        if group is None:
+            return f'{name} {subcommand}'
+        return f'{name} {group} {subcommand}'
+
     @property
     def description(self) -> str:
         """
@@ -86,15 +137,15 @@ class Context:
         """
         return self.interaction.version
 
-    @property
+    @cached_slot_property('_cs_data')
     def data(self) -> InteractionData:
         """
         Returns the application command data
         """
         return InteractionData(**self.interaction.data)
 
-    @property
-    def _modal_values(self):
+    @cached_slot_property('_cs_modal_values')
+    def _modal_values(self) -> Dict[str, Any]:
         options = {}
         comps = [data['components'][0] for data in self.data.components]
         for comp in comps:
@@ -106,8 +157,8 @@ class Context:
                 raise ValueError('Invalid component type') from None
         return options
 
-    @property
-    def _resolved(self):
+    @cached_slot_property('_cs_resolved')
+    def _resolved(self) -> Optional[Resolved]:
         r_data = self.data.resolved
         return Resolved(r_data, self) if r_data else None
 
@@ -123,7 +174,18 @@ class Context:
             user_id = int(self.data.target_id)
             return self._resolved.users[user_id]
 
-    @property
+    @cached_slot_property('_cs_route_key')
+    def _route_key(self) -> Tuple[int, Optional[str], Optional[str]]:
+        options = self.interaction.data.get('options')
+        if options:
+            first = options[0]
+            if first['type'] == OptionType.SUBCOMMAND.value:
+                return self.id, None, first['name']
+            if first['type'] == OptionType.SUBCOMMAND_GROUP.value:
+                return self.id, first['name'], first['options'][0]['name']
+        return self.id, None, None
+
+    @cached_slot_property('_cs_parsed_options')
     def _parsed_options(self) -> Dict[str, Any]:
         container = {}
         options = self.data.options
@@ -167,11 +229,15 @@ class Context:
 
     async def defer(self, ephemeral: bool = False) -> None:
         """
-        Defers the application command interaction for responding later
+        Defers the application command interaction for responding later,
+        does nothing if the scheduler already deferred it while it was queued
         """
+        if self._auto_deferred:
+            return
         if self._deferred:
             raise discord.ClientException('Cannot defer already deferred or responded interaction')
         await self._adapter.post_to_delay(ephemeral)
+        self._mark_responded()
         self._deferred = True
         self._invisible = ephemeral
 
@@ -226,12 +292,16 @@ class Context:
         Sends a modal as a response to the application command
         """
         await self._adapter.post_modal(modal=modal)
+        self._mark_responded()
 
-    async def send_automated_choices(self, choices: List[Choice]):
+    async def send_automated_choices(self, choices: List[Union[Choice, Dict[str, Any]]]):
         """
         Sends an automated choices list to application command UI
         """
-        await self._adapter.post_autocomplete_response(choices)
+        payload = [choice.data if isinstance(choice, Choice) else choice for choice in choices]
+        await self._adapter.post_autocomplete_response(payload)
+        self._sent_choices = payload
+        self._mark_responded()
 
     async def send_message(
             self,
@@ -268,59 +338,126 @@ class Context:
 
     async def send_response(
             self,
-            content: Optional[Union[str, Any]] = MISSING,
+            content: Optional[Union[str, ResponseTemplate, RenderedResponse, Any]] = MISSING,
             *,
             tts: bool = False,
             ephemeral: bool = False,
-            file: Optional[discord.File] = None,
-            files: Sequence[discord.File] = None,
+            file: Optional[FileLike] = None,
+            files: Sequence[FileLike] = None,
             embed: Optional[discord.Embed] = None,
             embeds: Optional[List[Optional[discord.Embed]]] = None,
             allowed_mentions: Optional[discord.AllowedMentions] = None,
             view: Optional[discord.ui.View] = None,
             views: Optional[List[discord.ui.View]] = None,
             delete_after: Optional[float] = None,
-    ) -> discord.Message:
-        """
-        Sends a response to the application command
-        """
+            fetch_message: bool = False,
+    ) -> ResponseMessage:
+        """
+        Sends a response to the application command, content may be a response template.
+        Returns a handle to the response message, which is not fetched unless fetch_message is True
+        or a view had to be bound to it, awaiting the handle fetches the message on demand.
+        """
+        if isinstance(content, ResponseTemplate):
+            content = content.render()
+        if self._auto_deferred:
+            # the scheduler deferred this interaction while it was queued, so answer by editing the placeholder
+            self._auto_deferred = False
+            if ephemeral:
+                # the placeholder is public and can not be made ephemeral, reply privately and remove it
+                followup = await self.send_followup(
+                    content, tts=tts, ephemeral=True, file=file, files=files, embed=embed, embeds=embeds,
+                    allowed_mentions=allowed_mentions, view=view, views=views, delete_after=delete_after)
+                try:
+                    await self._adapter.delete_response()
+                except discord.HTTPException:
+                    pass
+                return ResponseMessage(self, followup.message)
+            if isinstance(content, RenderedResponse):
+                data = await self._adapter.patch_rendered(content)
+                if delete_after:
+                    self._delete_response_after(delete_after)
+                self.original_message = discord.Message(
+                    state=self.client._connection, data=data, channel=self.channel)  # type: ignore
+                return ResponseMessage(self)
+            await self.edit_response(
+                content=content,
+                file=file if file is not None else MISSING,
+                files=files if files is not None else MISSING,
+                embed=embed if embed is not None else MISSING,
+                embeds=embeds if embeds is not None else MISSING,
+                allowed_mentions=allowed_mentions if allowed_mentions is not None else MISSING,
+                view=view if view is not None else MISSING,
+                views=views if views is not None else MISSING,
+                delete_after=delete_after,
+            )
+            return ResponseMessage(self)
         if self._deferred:
             raise discord.ClientException('Cannot send response to already responded or deferred context')
 
-        await self._adapter.post_response(
-            tts=tts, view=view, file=file, files=files, views=views, embed=embed,
-            embeds=embeds, content=content, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
+        if isinstance(content, RenderedResponse):
+            message = await self._adapter.post_rendered(content, ephemeral=ephemeral)
+        else:
+            message = await self._adapter.post_response(
+                tts=tts, view=view, file=file, files=files, views=views, embed=embed,
+                embeds=embeds, content=content, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
+        self._mark_responded()
         self._deferred = True
         self._invisible = ephemeral
-        self.original_message = await self._adapter.original_message()
+        if message is not None:
+            self.original_message = message
         if delete_after:
-            await self.original_message.delete(delay=delete_after)
+            self._delete_response_after(delete_after)
+        if fetch_message:
+            await self.original_response()
+        return ResponseMessage(self)
+
+    async def original_response(self) -> discord.Message:
+        """
+        Returns the message of the original response, fetching it only on first use
+        """
+        if self.original_message is None:
+            self.original_message = await self._adapter.original_message()
         return self.original_message
 
+    def _delete_response_after(self, delay: float):
+        async def delay_delete():
+            await asyncio.sleep(delay)
+            try:
+                await self.delete_response()
+            except discord.HTTPException:
+                pass
+        asyncio.create_task(delay_delete())
+
     async def send_followup(
             self,
-            content: Optional[Union[str, Any]] = MISSING,
+            content: Optional[Union[str, ResponseTemplate, RenderedResponse, Any]] = MISSING,
             *,
             tts: bool = False,
             ephemeral: bool = False,
             embed: Optional[discord.Embed] = None,
             embeds: Optional[List[discord.Embed]] = None,
             allowed_mentions: Optional[discord.AllowedMentions] = None,
-            file: Optional[discord.File] = None,
-            files: Optional[List[discord.File]] = None,
+            file: Optional[FileLike] = None,
+            files: Optional[List[FileLike]] = None,
             view: Optional[discord.ui.View] = None,
             views: Optional[List[discord.ui.View]] = None,
             delete_after: Optional[float] = None,
     ) -> Followup:
         """
-        Sends a followup to the responded or deferred application command
+        Sends a followup to the responded or deferred application command,
+        content may be a response template
         """
         if not self._deferred:
             raise discord.ClientException('Cannot send followup to a non responded or deferred context')
 
-        data = await self._adapter.post_followup(
-            tts=tts, file=file, view=view, files=files, embed=embed, views=views,
-            embeds=embeds, content=content, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
+        if isinstance(content, ResponseTemplate):
+            content = content.render()
+        if isinstance(content, RenderedResponse):
+            data = await self._adapter.post_followup_rendered(content, ephemeral=ephemeral)
+        else:
+            data = await self._adapter.post_followup(
+                tts=tts, file=file, view=view, files=files, embed=embed, views=views,
+                embeds=embeds, content=content, ephemeral=ephemeral, allowed_mentions=allowed_mentions)
 
         followup_message = Followup(self, data)
 
@@ -342,8 +479,8 @@ class Context:
             embed: Optional[discord.Embed] = MISSING,
             embeds: Optional[List[discord.Embed]] = MISSING,
             allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
-            file: Optional[discord.File] = MISSING,
-            files: Optional[List[discord.File]] = MISSING,
+            file: Optional[FileLike] = MISSING,
+            files: Optional[List[FileLike]] = MISSING,
             view: Optional[discord.ui.View] = MISSING,
             views: Optional[List[discord.ui.View]] = MISSING,
             delete_after: Optional[float] = None,
@@ -355,9 +492,10 @@ class Context:
             content=content, file=file, files=files, embed=embed,
             embeds=embeds, view=view, views=views, allowed_mentions=allowed_mentions)
         if delete_after:
-            await self.original_message.delete(delay=delete_after)
-        return discord.Message(
+            self._delete_response_after(delete_after)
+        self.original_message = discord.Message(
             state=self.client._connection, data=data, channel=self.channel)  # type: ignore
+        return self.original_message
 
     async def delete_response(self):
         """
@@ -368,6 +506,36 @@ class Context:
             await self._adapter.delete_response()
 
 
+class ResponseMessage:
+    """
+    Handle to the message of a response, fetched and cached when awaited
+    """
+
+    __slots__ = ('_parent', '_message')
+
+    def __init__(self, parent: Context, message: Optional[discord.Message] = None):
+        self._parent = parent
+        self._message = message
+
+    def __await__(self):
+        return self.fetch().__await__()
+
+    @property
+    def message(self) -> Optional[discord.Message]:
+        """
+        Returns the message if it is already known, None otherwise
+        """
+        return self._message or self._parent.original_message
+
+    async def fetch(self) -> discord.Message:
+        """
+        Returns the message, fetching it only on first use
+        """
+        if self._message is None:
+            self._message = await self._parent.original_response()
+        return self._message
+
+
 class Followup:
     """
     Represents a followup to an application command
@@ -399,8 +567,8 @@ class Followup:
             embed: Optional[discord.Embed] = MISSING,
             embeds: Optional[List[discord.Embed]] = MISSING,
             allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
-            file: Optional[discord.File] = MISSING,
-            files: Optional[List[discord.File]] = MISSING,
+            file: Optional[FileLike] = MISSING,
+            files: Optional[List[FileLike]] = MISSING,
             view: Optional[discord.ui.View] = MISSING,
             views: Optional[List[discord.ui.View]] = MISSING,
             delete_after: Optional[float] = None,
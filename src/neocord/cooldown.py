@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from .enums import BucketType
+from typing import Any, Hashable, Optional, Tuple
+
+
+class Cooldown:
+    """
+    Token bucket rate limiter shared by every invocation of a command.
+    Each bucket allows `rate` uses and refills continuously over `per` seconds.
+    """
+
+    __slots__ = ('rate', 'per', 'bucket', '_buckets')
+
+    def __init__(self, rate: int, per: float, bucket: BucketType = BucketType.USER):
+        if rate < 1:
+            raise ValueError('Cooldown rate must be at least 1')
+        if per <= 0:
+            raise ValueError('Cooldown period must be greater than 0')
+        self.rate = rate
+        self.per = float(per)
+        self.bucket = bucket
+        # ordered by last use, so the stale buckets are always at the front
+        self._buckets: 'OrderedDict[Hashable, Tuple[float, float]]' = OrderedDict()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def _key(self, ctx: Any) -> Optional[Hashable]:
+        interaction = ctx.interaction
+        if self.bucket is BucketType.USER:
+            return interaction.user.id
+        if self.bucket is BucketType.GUILD:
+            return interaction.guild_id or interaction.user.id
+        if self.bucket is BucketType.CHANNEL:
+            return interaction.channel_id
+        return None
+
+    def _expire(self, now: float):
+        # a bucket untouched for a full period has refilled completely and can be forgotten
+        buckets = self._buckets
+        for _ in range(2):
+            if not buckets:
+                return
+            key, (_, last) = next(iter(buckets.items()))
+            if now - last < self.per:
+                return
+            del buckets[key]
+
+    def update_rate_limit(self, ctx: Any) -> float:
+        """
+        Consumes a token for the context's bucket.
+        Returns 0 if the invocation is allowed, otherwise the seconds to wait.
+        """
+        now = time.monotonic()
+        key = self._key(ctx)
+        buckets = self._buckets
+        entry = buckets.get(key)
+        if entry is None:
+            tokens = float(self.rate)
+        else:
+            tokens, last = entry
+            tokens = min(float(self.rate), tokens + (now - last) * self.rate / self.per)
+            buckets.move_to_end(key)
+        if tokens >= 1:
+            buckets[key] = (tokens - 1, now)
+            retry_after = 0.0
+        else:
+            buckets[key] = (tokens, now)
+            retry_after = (1 - tokens) * self.per / self.rate
+        self._expire(now)
+        return retry_after
+
+    def reset(self, ctx: Any = None):
+        """
+        Resets the bucket of the given context or every bucket if no context is given
+        """
+        if ctx is None:
+            self._buckets.clear()
+        else:
+            self._buckets.pop(self._key(ctx), None)
@@ -5,9 +5,11 @@ from .errors import *
 from .https import *
 from discord.http import Route
 from discord.ext import commands
+from collections import abc
 from dataclasses import dataclass
 from .origin import ApplicationCommandOrigin
-from typing import List, Optional, Union, Any, Dict
+from discord.utils import cached_slot_property
+from typing import List, Optional, Union, Any, Dict, Mapping, Callable, Iterator
 from .enums import OptionType, CommandType, try_enum
 
 
@@ -36,45 +38,91 @@ class InteractionData:
     components: Optional[List[dict]] = None
 
 
+class _LazyMapping(abc.Mapping):
+    """
+    Read only mapping of resolved payloads keyed by id,
+    each object is built on first access and reused afterwards
+    """
+
+    __slots__ = ('_payloads', '_factory', '_objects')
+
+    def __init__(self, payloads: Dict[str, Any], factory: Callable[[int, Any], Any]):
+        self._payloads = payloads
+        self._factory = factory
+        self._objects: Dict[int, Any] = {}
+
+    def __getitem__(self, key: int) -> Any:
+        try:
+            return self._objects[key]
+        except KeyError:
+            payload = self._payloads[str(key)]
+        obj = self._objects[key] = self._factory(key, payload)
+        return obj
+
+    def __contains__(self, key: object) -> bool:
+        return str(key) in self._payloads
+
+    def __iter__(self) -> Iterator[int]:
+        return (int(key) for key in self._payloads)
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} keys={list(self)}>'
+
+
 class Resolved:
+
+    __slots__ = (
+        'data',
+        'client',
+        '_c',
+        '_cs_users',
+        '_cs_members',
+        '_cs_roles',
+        '_cs_channels',
+        '_cs_messages',
+        '_cs_attachments',
+    )
+
     def __init__(self, data: dict, c):
-        self.__c = c
+        self._c = c
         self.data = data
         self.client = c.client
 
-    @property
-    def users(self) -> Dict[int, discord.User]:
-        if self.data.get('users'):
-            return {int(key): discord.User(data=payload, state=self.client._connection)
-                    for key, payload in self.data['users'].items()}
+    def _lazy(self, key: str, factory: Callable[[int, Any], Any]) -> Optional[Mapping[int, Any]]:
+        payloads = self.data.get(key)
+        if payloads:
+            return _LazyMapping(payloads, factory)
 
-    @property
-    def members(self) -> Dict[int, discord.Member]:
-        if self.data.get('members'):
-            return {int(key): self.__c.guild.get_member(int(key)) for key, _ in self.data['members'].items()}
+    @cached_slot_property('_cs_users')
+    def users(self) -> Optional[Mapping[int, discord.User]]:
+        return self._lazy('users', lambda _, payload: discord.User(data=payload, state=self.client._connection))
 
-    @property
-    def roles(self) -> Dict[int, discord.Role]:
-        if self.data.get('roles'):
-            return {int(key): discord.Role(guild=self.__c.guild, data=payload, state=self.client._connection)
-                    for key, payload in self.data['roles'].items()}
+    @cached_slot_property('_cs_members')
+    def members(self) -> Optional[Mapping[int, discord.Member]]:
+        return self._lazy('members', lambda key, _: self._c.guild.get_member(key))
 
-    @property
-    def channels(self) -> Dict[int, discord.abc.GuildChannel]:
-        if self.data.get('channels'):
-            return {int(key): self.__c.guild.get_channel(int(key)) for key, _ in self.data['channels'].items()}
+    @cached_slot_property('_cs_roles')
+    def roles(self) -> Optional[Mapping[int, discord.Role]]:
+        return self._lazy(
+            'roles', lambda _, payload: discord.Role(guild=self._c.guild, data=payload, state=self.client._connection))
 
-    @property
-    def messages(self) -> Dict[int, discord.Message]:
-        if self.data.get('messages'):
-            return {int(key): discord.Message(data=payload, state=self.client._connection, channel=self.__c.channel)
-                    for key, payload in self.data['messages'].items()}
+    @cached_slot_property('_cs_channels')
+    def channels(self) -> Optional[Mapping[int, discord.abc.GuildChannel]]:
+        return self._lazy('channels', lambda key, _: self._c.guild.get_channel(key))
 
-    @property
-    def attachments(self) -> Dict[int, discord.Attachment]:
-        if self.data.get('attachments'):
-            return {int(key): discord.Attachment(data=payload, state=self.client._connection)
-                    for key, payload in self.data['attachments'].items()}
+    @cached_slot_property('_cs_messages')
+    def messages(self) -> Optional[Mapping[int, discord.Message]]:
+        return self._lazy(
+            'messages',
+            lambda _, payload: discord.Message(data=payload, state=self.client._connection, channel=self._c.channel))
+
+    @cached_slot_property('_cs_attachments')
+    def attachments(self) -> Optional[Mapping[int, discord.Attachment]]:
+        return self._lazy(
+            'attachments', lambda _, payload: discord.Attachment(data=payload, state=self.client._connection))
 
 
 class DummyOption:
@@ -132,20 +180,15 @@ class SlashCommandOption:
 
         elif self.type is OptionType.MENTIONABLE:
             target_id = int(self.data.get('value'))
-            map_ = {}
-            if not self.guild:
-                if self._resolved.users:
-                    map_.update(self._resolved.users)
-                if self._resolved.roles:
-                    map_.update(self._resolved.roles)
-            else:
-                if self._resolved.users:
-                    map_.update(self._resolved.users)
-                if self._resolved.roles:
-                    map_.update(self._resolved.roles)
-                if self._resolved.members:
-                    map_.update(self._resolved.members)
-            return map_[target_id]
+            resolved = self._resolved
+            # a member takes precedence over its user, the member may be missing from the cache
+            if self.guild and resolved.members and target_id in resolved.members:
+                member = resolved.members[target_id]
+                if member is not None:
+                    return member
+            if resolved.roles and target_id in resolved.roles:
+                return resolved.roles[target_id]
+            return resolved.users[target_id]
 
         elif self.type is OptionType.NUMBER:
             return self.data['value']
@@ -203,9 +246,7 @@ class ApplicationCommand:
 
     async def delete(self):
         await delete_command(self._client, self.id, self.guild_id)
-
-        await self._client.http.request(route)
-        self._client._application_commands.pop(self.id)
+        self._client._application_commands.pop(self.id, None)
 
     async def update(self, new: ApplicationCommandOrigin) -> ApplicationCommand:
         if new.type is self.type:
@@ -215,7 +256,6 @@ class ApplicationCommand:
                 raise e
             else:
                 updated = self._from_data(self._client, data)
-                self._client._application_commands.pop(updated.id)
                 self._client._application_commands[updated.id] = updated
                 return updated
         raise CommandTypeMismatched(
@@ -66,3 +66,16 @@ class ComponentType(Enum):
     BUTTON = 2
     SELECT_MENU = 3
     TEXT_INPUT = 4
+
+
+class OverflowPolicy(Enum):
+    WAIT = 1
+    REJECT = 2
+    DEFER = 3
+
+
+class BucketType(Enum):
+    USER = 1
+    GUILD = 2
+    CHANNEL = 3
+    GLOBAL = 4
@@ -66,3 +66,12 @@ class AfterInvokeJobFailure(Exception):
     """
     def __init__(self, message: str):
         super().__init__(message)
+
+
+class CommandOnCooldown(Exception):
+    """
+    Raised when an application command is used while it is on cooldown
+    """
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
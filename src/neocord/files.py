@@ -0,0 +1,78 @@
+import io
+import os
+import mmap
+import discord
+from typing import Optional, Union
+
+
+__all__ = ['StreamedFile']
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _BufferReader(io.RawIOBase):
+    """
+    Seekable raw reader over a memory mapped or other buffer protocol object,
+    copies at most one chunk at a time out of the buffer
+    """
+
+    def __init__(self, buffer: Union[mmap.mmap, memoryview, bytes, bytearray]):
+        self._view = memoryview(buffer).cast('B')
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._position = max(0, min(offset, len(self._view)))
+        return self._position
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._position:self._position + len(b)]
+        size = len(chunk)
+        b[:size] = chunk
+        self._position += size
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+class StreamedFile(discord.File):
+    """
+    Attachment read from a path or a memory mapped buffer in chunks while the request body is written,
+    so the file never has to be loaded into memory as a whole.
+    The file is rewound before every retry of the upload.
+    """
+
+    def __init__(
+            self,
+            source: Union[str, os.PathLike, mmap.mmap, memoryview, bytes, bytearray],
+            filename: Optional[str] = None,
+            *,
+            spoiler: bool = False,
+            description: Optional[str] = None,
+    ):
+        if isinstance(source, (str, os.PathLike)):
+            if filename is None:
+                filename = os.path.basename(os.fspath(source))
+            fp = open(source, 'rb', buffering=CHUNK_SIZE)
+        else:
+            if filename is None:
+                raise ValueError('A filename is required for buffer backed files')
+            fp = io.BufferedReader(_BufferReader(source), buffer_size=CHUNK_SIZE)
+        super().__init__(fp, filename, spoiler=spoiler, description=description)
+        # the stream is opened here, so it is closed with the file
+        self._owner = True
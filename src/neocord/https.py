@@ -10,6 +10,14 @@ async def post_command(client, command, guild_id: int = None):
     return await client.http.request(r, json=command.to_dict())
 
 
+async def put_commands(client, commands: list, guild_id: int = None):
+    if guild_id:
+        r = Route('PUT', f'/applications/{client.application_id}/guilds/{guild_id}/commands')
+    else:
+        r = Route('PUT', f'/applications/{client.application_id}/commands')
+    return await client.http.request(r, json=[command.to_dict() for command in commands])
+
+
 async def patch_existing_command(client, old, new):
     if old.guild_specific:
         r = Route('PATCH', f'/applications/{old.application_id}/guilds/{old.guild_id}/commands/{old.id}')
@@ -1,5 +1,7 @@
+import re
 import discord
-from typing import Any, Union, List, Dict, Optional
+from bisect import bisect_left, bisect_right
+from typing import Any, Union, List, Dict, Optional, Iterable, Tuple
 from .origin import ApplicationCommandOrigin
 from .enums import ChannelType, CommandType, OptionType
 
@@ -18,6 +20,7 @@ __all__ = [
     'NumberOption',
     'AttachmentOption',
     'Choice',
+    'ChoiceIndex',
 ]
 
 
@@ -38,6 +41,128 @@ class Choice:
         self.data = {"name": name, "value": value}
 
 
+class ChoiceIndex:
+    """
+    Represents a prebuilt index over a large set of choices for autocomplete.
+    Lookups are case-insensitive and return pre-serialized choice dicts
+    which can be passed straight to Context.send_automated_choices.
+    """
+
+    _TOKEN = re.compile(r'\w+')
+
+    def __init__(self, pairs: Iterable[Tuple[str, Any]], *, substring: bool = False, tokens: bool = False):
+        entries = sorted(((str(name).casefold(), name, value) for name, value in pairs), key=lambda e: e[0])
+        self._keys: List[str] = [key for key, _, _ in entries]
+        self._choices: List[Dict[str, Any]] = [{"name": name, "value": value} for _, name, value in entries]
+        self._haystack: Optional[str] = None
+        self._offsets: List[int] = []
+        self._token_keys: List[str] = []
+        self._token_ids: List[Tuple[int, ...]] = []
+        self._token_totals: List[int] = [0]
+
+        if substring:
+            offset = 0
+            for key in self._keys:
+                self._offsets.append(offset)
+                offset += len(key) + 1
+            self._haystack = '\n'.join(key.replace('\n', ' ') for key in self._keys)
+
+        if tokens:
+            table: Dict[str, List[int]] = {}
+            for index, key in enumerate(self._keys):
+                for token in set(self._TOKEN.findall(key)):
+                    table.setdefault(token, []).append(index)
+            self._token_keys = sorted(table)
+            self._token_ids = [tuple(table[token]) for token in self._token_keys]
+            # running posting list sizes, the size of a token range is a single subtraction
+            for ids in self._token_ids:
+                self._token_totals.append(self._token_totals[-1] + len(ids))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _prefix(self, query: str, limit: int, found: Dict[int, None]):
+        keys = self._keys
+        index = bisect_left(keys, query)
+        while index < len(keys) and len(found) < limit and keys[index].startswith(query):
+            found[index] = None
+            index += 1
+
+    def _postings(self, word: str) -> Optional[Tuple[int, ...]]:
+        position = bisect_left(self._token_keys, word)
+        if position < len(self._token_keys) and self._token_keys[position] == word:
+            return self._token_ids[position]
+        return None
+
+    def _token(self, query: str, limit: int, found: Dict[int, None]):
+        # every word but the last must be a whole token of the name, the last one a token prefix
+        words = self._TOKEN.findall(query)
+        if not words:
+            return
+        *rest, last = words
+        drivers = []
+        for word in rest:
+            postings = self._postings(word)
+            if postings is None:
+                return
+            drivers.append(postings)
+        token_keys = self._token_keys
+        start = bisect_left(token_keys, last)
+        end = bisect_left(token_keys, last + '\U0010ffff', start)
+        if start == end:
+            return
+        required = set(rest)
+        keys = self._keys
+
+        # walk whichever side has the fewest candidates and verify the rest per name
+        driver = min(drivers, key=len) if drivers else None
+        if driver is not None and len(driver) < self._token_totals[end] - self._token_totals[start]:
+            for index in driver:
+                if len(found) >= limit:
+                    return
+                if index in found:
+                    continue
+                tokens = set(self._TOKEN.findall(keys[index]))
+                if required <= tokens and any(token.startswith(last) for token in tokens):
+                    found[index] = None
+            return
+
+        for position in range(start, end):
+            for index in self._token_ids[position]:
+                if len(found) >= limit:
+                    return
+                if index in found:
+                    continue
+                if required and not required <= set(self._TOKEN.findall(keys[index])):
+                    continue
+                found[index] = None
+
+    def _substring(self, query: str, limit: int, found: Dict[int, None]):
+        haystack = self._haystack
+        position = haystack.find(query)
+        while position != -1 and len(found) < limit:
+            index = bisect_right(self._offsets, position) - 1
+            found.setdefault(index, None)
+            position = haystack.find(query, self._offsets[index] + len(self._keys[index]) + 1)
+
+    def search(self, query: str, limit: int = 25) -> List[Dict[str, Any]]:
+        """
+        Returns up to `limit` choices, prefix matches first followed by
+        token and substring matches if the index was built with them.
+        The returned dicts are shared and must not be modified.
+        """
+        query = query.casefold()
+        if not query:
+            return self._choices[:limit]
+        found: Dict[int, None] = {}
+        self._prefix(query, limit, found)
+        if len(found) < limit and self._token_keys:
+            self._token(query, limit, found)
+        if len(found) < limit and self._haystack is not None:
+            self._substring(query, limit, found)
+        return [self._choices[index] for index in found]
+
+
 class StrOption(Option):
     """
     Represents a string option for an application command
@@ -0,0 +1,161 @@
+import time
+import asyncio
+import logging
+import aiohttp
+import discord
+from .cache import TTLCache
+from discord.http import Route, json_or_text
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+
+_log = logging.getLogger(__name__)
+
+# interaction tokens are valid for 15 minutes, their buckets are of no use afterwards
+TOKEN_TTL = 900.0
+
+
+class _Bucket:
+    __slots__ = ('lock', 'remaining', 'reset_at')
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def update(self, response: aiohttp.ClientResponse):
+        remaining = response.headers.get('X-Ratelimit-Remaining')
+        reset_after = response.headers.get('X-Ratelimit-Reset-After')
+        if remaining is not None:
+            self.remaining = int(remaining)
+        if reset_after is not None:
+            self.reset_at = time.monotonic() + float(reset_after)
+
+    async def wait(self):
+        if self.remaining == 0:
+            delay = self.reset_at - time.monotonic()
+            if delay > 0:
+                _log.debug('Interaction bucket exhausted, waiting %.2fs', delay)
+                await asyncio.sleep(delay)
+            self.remaining = None
+
+
+class InteractionLane:
+    """
+    HTTP client for the interaction callback and webhook routes, which are authorized
+    by the interaction token and are not subject to the global rate limit.
+    It has its own connection pool so interaction responses never queue behind
+    bot token requests, and tracks the rate limit bucket of every interaction token.
+    """
+
+    def __init__(
+            self,
+            client: discord.Client,
+            *,
+            max_connections: int = 100,
+            keepalive_timeout: float = 60.0,
+            max_tokens: int = 10000,
+    ):
+        self.client = client
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._buckets = TTLCache(max_tokens, TOKEN_TTL)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _bucket(self, token: str) -> _Bucket:
+        bucket = self._buckets.get(token, count=False)
+        if bucket is None:
+            bucket = _Bucket()
+            self._buckets.set(token, bucket)
+        return bucket
+
+    async def request(
+            self,
+            route: Route,
+            token: str,
+            *,
+            files: Optional[Sequence[discord.File]] = None,
+            form: Optional[Iterable[Dict[str, Any]]] = None,
+            **kwargs: Any,
+    ) -> Union[Dict[str, Any], str]:
+        """
+        Sends a request on an interaction route, retrying rate limited and failed attempts
+        """
+        http = self.client.http
+        kwargs['headers'] = {'User-Agent': http.user_agent}
+        if http.proxy is not None:
+            kwargs['proxy'] = http.proxy
+        if http.proxy_auth is not None:
+            kwargs['proxy_auth'] = http.proxy_auth
+
+        session = self._get_session()
+        bucket = self._bucket(token)
+        response: Optional[aiohttp.ClientResponse] = None
+        data: Union[Dict[str, Any], str, None] = None
+        async with bucket.lock:
+            for tries in range(5):
+                await bucket.wait()
+                if files:
+                    for f in files:
+                        f.reset(seek=tries)
+                if form:
+                    form_data = aiohttp.FormData(quote_fields=False)
+                    for params in form:
+                        form_data.add_field(**params)
+                    kwargs['data'] = form_data
+
+                try:
+                    async with session.request(route.method, route.url, **kwargs) as response:
+                        data = await json_or_text(response)
+                        bucket.update(response)
+
+                        if 300 > response.status >= 200:
+                            return data
+
+                        if response.status == 429:
+                            if not response.headers.get('Via') or isinstance(data, str):
+                                raise discord.HTTPException(response, data)
+                            retry_after = float(data['retry_after'])
+                            _log.warning(
+                                'Interaction route %s %s is rate limited, retrying in %.2fs',
+                                route.method, route.path, retry_after)
+                            await asyncio.sleep(retry_after)
+                            continue
+
+                        if response.status in {500, 502, 504, 524}:
+                            await asyncio.sleep(1 + tries * 2)
+                            continue
+
+                        if response.status == 403:
+                            raise discord.Forbidden(response, data)
+                        if response.status == 404:
+                            raise discord.NotFound(response, data)
+                        if response.status >= 500:
+                            raise discord.DiscordServerError(response, data)
+                        raise discord.HTTPException(response, data)
+
+                except OSError as e:
+                    if tries < 4 and e.errno in (54, 10054):
+                        await asyncio.sleep(1 + tries * 2)
+                        continue
+                    raise
+
+            if response is not None:
+                if response.status >= 500:
+                    raise discord.DiscordServerError(response, data)
+                raise discord.HTTPException(response, data)
+            raise RuntimeError('Unreachable code in interaction HTTP handling')
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._buckets.clear()
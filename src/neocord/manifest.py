@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# top level fields we send when registering, anything else in an API payload is server side state
+_COMMAND_FIELDS = (
+    'name',
+    'type',
+    'description',
+    'options',
+    'default_member_permissions',
+    'name_localizations',
+    'description_localizations',
+    'nsfw',
+)
+
+
+def _is_default(value: Any) -> bool:
+    return value is None or value is False or (isinstance(value, (str, list, dict)) and not value)
+
+
+def _strip(value: Any) -> Any:
+    # the API omits or nulls fields left at their default, so treat those as absent on both sides
+    if isinstance(value, dict):
+        stripped = {key: _strip(item) for key, item in value.items()}
+        return {key: item for key, item in stripped.items() if not _is_default(item)}
+    if isinstance(value, list):
+        return [_strip(item) for item in value]
+    return value
+
+
+def canonical_payload(payload: Dict[str, Any], guild_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Returns the comparable form of a local or API command payload
+    """
+    data = _strip({key: payload.get(key) for key in _COMMAND_FIELDS})
+    data['type'] = int(payload.get('type') or 1)
+    if guild_id is None:
+        # dm_permission defaults to true and is not returned for guild commands
+        dm_permission = payload.get('dm_permission')
+        data['dm_permission'] = True if dm_permission is None else bool(dm_permission)
+    return data
+
+
+def payload_hash(payload: Dict[str, Any], guild_id: Optional[int] = None) -> str:
+    """
+    Returns a stable digest of the canonical form of a command payload
+    """
+    canonical = canonical_payload(payload, guild_id)
+    encoded = json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def command_key(payload: Dict[str, Any]) -> Tuple[str, int]:
+    return payload['name'], int(payload.get('type') or 1)
+
+
+class CommandManifest:
+    """
+    Persisted record of the registered application commands per scope,
+    used to diff the local commands without fetching them from the API
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.application_id: Optional[int] = None
+        self.scopes: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    @staticmethod
+    def _scope_key(guild_id: Optional[int]) -> str:
+        return 'global' if guild_id is None else str(guild_id)
+
+    @classmethod
+    def load(cls, path: str) -> 'CommandManifest':
+        """
+        Reads the manifest from disk, a missing or unreadable file gives an empty manifest
+        """
+        manifest = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        manifest.application_id = raw.get('application_id')
+        manifest.scopes = raw.get('scopes') or {}
+        return manifest
+
+    @property
+    def guild_ids(self) -> List[Optional[int]]:
+        return [None if key == 'global' else int(key) for key in self.scopes]
+
+    def scope(self, guild_id: Optional[int]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """
+        Returns the recorded API payloads of a scope keyed by (name, type)
+        """
+        entries = self.scopes.get(self._scope_key(guild_id), {})
+        return {command_key(entry['data']): entry['data'] for entry in entries.values()}
+
+    def hashes(self, guild_id: Optional[int]) -> Dict[Tuple[str, int], str]:
+        entries = self.scopes.get(self._scope_key(guild_id), {})
+        return {command_key(entry['data']): entry['hash'] for entry in entries.values()}
+
+    def record(self, guild_id: Optional[int], payloads: List[Dict[str, Any]]):
+        """
+        Replaces the recorded payloads of a scope
+        """
+        if not payloads:
+            self.scopes.pop(self._scope_key(guild_id), None)
+            return
+        self.scopes[self._scope_key(guild_id)] = {
+            '{}:{}'.format(*command_key(data)): {'hash': payload_hash(data, guild_id), 'data': data}
+            for data in payloads
+        }
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp = f'{self.path}.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'application_id': self.application_id, 'scopes': self.scopes}, f)
+        os.replace(temp, self.path)
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+from typing import Dict, Any, Optional, Tuple
+
+
+# upper bounds in seconds, the 3s bound matches the deadline for the initial interaction response
+BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, float('inf'))
+RESPONSE_DEADLINE = 3.0
+
+
+class Histogram:
+    """
+    Fixed bucket latency histogram
+    """
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the q-th percentile
+        """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': {str(bound): count for bound, count in zip(BUCKETS, self.counts) if count},
+        }
+
+
+class CommandMetrics:
+    """
+    Counters and latency histograms of a single command or subcommand
+    """
+
+    __slots__ = ('invocations', 'errors', 'late_responses', 'timings')
+
+    def __init__(self):
+        self.invocations = 0
+        self.errors = 0
+        self.late_responses = 0
+        self.timings: Dict[str, Histogram] = {}
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self.timings.get(stage)
+        if histogram is None:
+            histogram = self.timings[stage] = Histogram()
+        histogram.observe(seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'invocations': self.invocations,
+            'errors': self.errors,
+            'late_responses': self.late_responses,
+            'timings': {stage: histogram.to_dict() for stage, histogram in self.timings.items()},
+        }
+
+
+class Metrics:
+    """
+    In-process registry of per-command metrics keyed by qualified command name
+    """
+
+    def __init__(self):
+        self._commands: Dict[str, CommandMetrics] = {}
+
+    def __getitem__(self, name: str) -> CommandMetrics:
+        metrics = self._commands.get(name)
+        if metrics is None:
+            metrics = self._commands[name] = CommandMetrics()
+        return metrics
+
+    def __contains__(self, name: str):
+        return name in self._commands
+
+    def invoked(self, name: str):
+        self[name].invocations += 1
+
+    def failed(self, name: str):
+        self[name].errors += 1
+
+    def observe(self, name: str, stage: str, seconds: float):
+        self[name].observe(stage, seconds)
+
+    def first_response(self, name: str, seconds: float):
+        metrics = self[name]
+        metrics.observe('first_response', seconds)
+        if seconds > RESPONSE_DEADLINE:
+            metrics.late_responses += 1
+
+    def snapshot(self, name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Returns the metrics of one command or of every command as plain dicts
+        """
+        if name is not None:
+            metrics = self._commands.get(name)
+            return metrics.to_dict() if metrics else {}
+        return {key: metrics.to_dict() for key, metrics in self._commands.items()}
+
+    def reset(self):
+        self._commands.clear()
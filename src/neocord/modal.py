@@ -4,10 +4,28 @@ import discord
 from functools import wraps
 from typing import Callable
 from discord.utils import MISSING
+from .parser import Binder
 from typing import Optional, Union, Any, Sequence, List, Dict
 from .enums import TextFieldLength, ModalFieldType, InteractionCallbackType, ComponentType
 
 
+MODAL_ID_SEPARATOR = ':'
+
+
+def modal_id(prefix: str, *state: Any) -> str:
+    """
+    Builds a custom_id routed to the cog modal handler registered for the prefix.
+    Small pieces of state can be appended and are handed back as `ctx.modal_state`.
+    """
+    parts = [prefix, *map(str, state)]
+    if any(MODAL_ID_SEPARATOR in part for part in parts):
+        raise ValueError(f"Modal id parts can not contain `{MODAL_ID_SEPARATOR}`")
+    custom_id = MODAL_ID_SEPARATOR.join(parts)
+    if len(custom_id) > 100:
+        raise ValueError("Modal custom_id can not be longer than 100 characters")
+    return custom_id
+
+
 class Modal:
     """
     Represents a modal. This is a class that can be used to create a modal.
@@ -96,6 +114,6 @@ class Modal:
             callback = wrapper()
             if not asyncio.iscoroutinefunction(callback):
                 raise TypeError("callback must be a coroutine")
-            client._modals[self.custom_id] = callback
+            client._modals.set(self.custom_id, (callback, Binder(callback, skip=1, unwrap=False)))
             return self
         return decorator
@@ -1,43 +1,53 @@
+from __future__ import annotations
 import inspect
-from .context import Context
 from .enums import CommandType
-from typing import List, Dict, Any, Optional, Union, Callable
-
-
-def _build_prams(options: Dict[str, Any], func: Callable):
-    args = []
-    kwargs = {}
-    params = inspect.getfullargspec(func)
-    default_args = params.defaults
-    default_kwargs = params.kwonlydefaults
-    if default_args:
-        default_list = [*default_args]
-        for i in range(len(params.args[:2]) - len(default_list) - 1):
-            default_list.insert(i, None)
-
-        for arg, default_value in zip(params.args[2:], default_list):
+from typing import List, Dict, Any, Optional, Union, Callable, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .context import Context
+
+
+class Binder:
+    """
+    Maps option names onto the positional and keyword slots of a handler.
+    The handler signature is inspected once and the result reused for every call.
+    """
+
+    __slots__ = ('func', 'unwrap', 'positional', 'keywords')
+
+    def __init__(self, func: Callable, *, skip: int, unwrap: bool = True):
+        params = inspect.getfullargspec(func)
+        defaults = params.defaults or ()
+        offset = len(params.args) - len(defaults)
+        kw_defaults = params.kwonlydefaults or {}
+        self.func = func
+        self.unwrap = unwrap
+        self.positional: Tuple[Tuple[str, Any], ...] = tuple(
+            (arg, defaults[index - offset] if index >= offset else None)
+            for index, arg in enumerate(params.args) if index >= skip
+        )
+        self.keywords: Tuple[Tuple[str, Any], ...] = tuple((kw, kw_defaults.get(kw)) for kw in params.kwonlyargs)
+
+    def __repr__(self):
+        return f'<Binder func={self.func.__qualname__}>'
+
+    def __call__(self, options: Dict[str, Any]):
+        unwrap = self.unwrap
+        args = []
+        for arg, default in self.positional:
             option = options.get(arg)
             if option:
-                args.append(option.value)
+                args.append(option.value if unwrap else option)
             else:
-                args.append(default_value)
-    else:
-        for arg in params.args[2:]:
-            option = options.get(arg)
+                args.append(default)
+        kwargs = {}
+        for kw, default in self.keywords:
+            option = options.get(kw)
             if option:
-                args.append(option.value)
+                kwargs[kw] = option.value if unwrap else option
             else:
-                args.append(None)
-
-    for kw in params.kwonlyargs:
-        option = options.get(kw)
-        if option:
-            kwargs[kw] = option.value
-        elif default_kwargs:
-            kwargs[kw] = default_kwargs.get(kw)
-        else:
-            kwargs[kw] = None
-    return args, kwargs
+                kwargs[kw] = default
+        return args, kwargs
 
 
 def _build_ctx_menu_param(c: Context):
@@ -45,75 +55,3 @@ def _build_ctx_menu_param(c: Context):
         return c._target_user
     elif c.type is CommandType.MESSAGE:
         return c._target_message
-
-
-def _build_modal_prams(options: Dict[str, Any], func: Callable):
-    args = []
-    kwargs = {}
-    params = inspect.getfullargspec(func)
-    default_args = params.defaults
-    default_kwargs = params.kwonlydefaults
-    if default_args:
-        default_list = [*default_args]
-        for i in range(len(params.args[:1]) - len(default_list) - 1):
-            default_list.insert(i, None)
-
-        for arg, default_value in zip(params.args[1:], default_list):
-            option = options.get(arg)
-            if option:
-                args.append(option)
-            else:
-                args.append(default_value)
-    else:
-        for arg in params.args[1:]:
-            option = options.get(arg)
-            if option:
-                args.append(option)
-            else:
-                args.append(None)
-
-    for kw in params.kwonlyargs:
-        option = options.get(kw)
-        if option:
-            kwargs[kw] = option
-        elif default_kwargs:
-            kwargs[kw] = default_kwargs.get(kw)
-        else:
-            kwargs[kw] = None
-    return args, kwargs
-
-
-def _build_autocomplete_prams(options: Dict[str, Any], func: Callable):
-    args = []
-    kwargs = {}
-    params = inspect.getfullargspec(func)
-    default_args = params.defaults
-    default_kwargs = params.kwonlydefaults
-    if default_args:
-        default_list = [*default_args]
-        for i in range(len(params.args[:1]) - len(default_list) - 1):
-            default_list.insert(i, None)
-
-        for arg, default_value in zip(params.args[1:], default_list):
-            option = options.get(arg)
-            if option:
-                args.append(option.value)
-            else:
-                args.append(default_value)
-    else:
-        for arg in params.args[1:]:
-            option = options.get(arg)
-            if option:
-                args.append(option.value)
-            else:
-                args.append(None)
-
-    for kw in params.kwonlyargs:
-        option = options.get(kw)
-        if option:
-            kwargs[kw] = option.value
-        elif default_kwargs:
-            kwargs[kw] = default_kwargs.get(kw)
-        else:
-            kwargs[kw] = None
-    return args, kwargs
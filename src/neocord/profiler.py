@@ -0,0 +1,167 @@
+import os
+import time
+import logging
+import pstats
+import random
+import cProfile
+from typing import Any, Coroutine, Dict, Optional
+
+
+_log = logging.getLogger(__name__)
+
+
+class _ProfiledCoroutine:
+    """
+    Drives a coroutine with the profiler enabled only while the coroutine itself is running,
+    so time spent in other tasks between its awaits is not attributed to it.
+    """
+
+    __slots__ = ('coro', 'sample')
+
+    def __init__(self, coro: Coroutine, sample: '_Sample'):
+        self.coro = coro
+        self.sample = sample
+
+    def __await__(self):
+        coro = self.coro
+        value, error = None, None
+        while True:
+            profiling = self.sample.resume()
+            try:
+                if error is not None:
+                    yielded = coro.throw(error)
+                else:
+                    yielded = coro.send(value)
+            except StopIteration as e:
+                return e.value
+            finally:
+                if profiling:
+                    self.sample.pause()
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                value, error = None, e
+
+
+class _Sample:
+    __slots__ = ('profiler', 'name', 'profile', 'started', 'running', 'pending', 'ran')
+
+    def __init__(self, profiler: 'Profiler', name: str):
+        self.profiler = profiler
+        self.name = name
+        self.profile = cProfile.Profile()
+        self.started = time.perf_counter()
+        self.running = False
+        self.pending = 0
+        self.ran = False
+
+    def resume(self) -> bool:
+        if self.running or time.perf_counter() - self.started > self.profiler.max_duration:
+            return False
+        try:
+            self.profile.enable()
+        except ValueError:
+            # another profiler owns the interpreter
+            return False
+        self.running = True
+        self.ran = True
+        return True
+
+    def pause(self):
+        self.profile.disable()
+        self.running = False
+
+    def wrap(self, coro: Coroutine) -> Coroutine:
+        self.pending += 1
+        return self._run(coro)
+
+    async def _run(self, coro: Coroutine):
+        try:
+            return await _ProfiledCoroutine(coro, self)
+        finally:
+            self.pending -= 1
+            if not self.pending:
+                try:
+                    self.profiler._collect(self)
+                except Exception:
+                    # profiling must never fail the handler it observed
+                    _log.exception('Failed to collect the profile of `%s`', self.name)
+
+
+class Profiler:
+    """
+    Profiles a sampled fraction of application command invocations and aggregates
+    the results per command into `<directory>/<qualified name>.prof` files.
+    At most one invocation is profiled at a time and the number of samples per
+    minute and the profiled time per sample are capped to bound the overhead.
+    """
+
+    def __init__(
+            self,
+            directory: str = 'profiles',
+            *,
+            max_samples_per_minute: int = 6,
+            max_duration: float = 5.0,
+            flush_every: int = 10,
+    ):
+        self.directory = directory
+        self.max_samples_per_minute = max_samples_per_minute
+        self.max_duration = max_duration
+        self.flush_every = flush_every
+        self._active: Optional[_Sample] = None
+        self._window_start = 0.0
+        self._window_samples = 0
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._unflushed: Dict[str, int] = {}
+
+    def sample(self, name: str, rate: float) -> Optional[_Sample]:
+        """
+        Returns a sample for this invocation or None if it should not be profiled
+        """
+        if rate <= 0 or self._active is not None or random.random() >= rate:
+            return None
+        now = time.monotonic()
+        if now - self._window_start >= 60:
+            self._window_start = now
+            self._window_samples = 0
+        if self._window_samples >= self.max_samples_per_minute:
+            return None
+        self._window_samples += 1
+        self._active = _Sample(self, name)
+        return self._active
+
+    def _collect(self, sample: _Sample):
+        self._active = None
+        if not sample.ran:
+            # the profiler was never enabled, so there is nothing to aggregate
+            return
+        stats = self._stats.get(sample.name)
+        if stats is None:
+            self._stats[sample.name] = pstats.Stats(sample.profile)
+        else:
+            stats.add(sample.profile)
+        self._unflushed[sample.name] = self._unflushed.get(sample.name, 0) + 1
+        if self._unflushed[sample.name] >= self.flush_every:
+            self._dump(sample.name)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name.replace(' ', '.') + '.prof')
+
+    def _dump(self, name: str):
+        os.makedirs(self.directory, exist_ok=True)
+        self._stats[name].dump_stats(self._path(name))
+        self._unflushed[name] = 0
+
+    def flush(self):
+        """
+        Writes every command with unsaved samples to disk
+        """
+        for name, count in self._unflushed.items():
+            if count:
+                self._dump(name)
+
+    def stats(self, name: str) -> Optional[pstats.Stats]:
+        """
+        Returns the aggregated stats of a command by its qualified name
+        """
+        return self._stats.get(name)
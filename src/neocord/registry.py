@@ -0,0 +1,89 @@
+from types import MappingProxyType
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Mapping, Optional, Tuple, TYPE_CHECKING
+from .enums import CommandType
+
+if TYPE_CHECKING:
+    from .core import ApplicationCommand
+
+
+CommandKey = Tuple[str, CommandType, Optional[int]]
+
+
+class CommandRegistry(MutableMapping):
+    """
+    Application commands keyed by id with secondary indexes
+    by (name, type, guild id) and by guild, None being the global scope
+    """
+
+    def __init__(self):
+        self._by_id: Dict[int, 'ApplicationCommand'] = {}
+        self._by_key: Dict[CommandKey, 'ApplicationCommand'] = {}
+        self._by_guild: Dict[Optional[int], Dict[int, 'ApplicationCommand']] = {}
+
+    @staticmethod
+    def _key(command: 'ApplicationCommand') -> CommandKey:
+        return command.name, command.type, command.guild_id
+
+    def __getitem__(self, command_id: int) -> 'ApplicationCommand':
+        return self._by_id[command_id]
+
+    def __setitem__(self, command_id: int, command: 'ApplicationCommand'):
+        if command_id in self._by_id:
+            # the name or scope may have changed, drop the stale index entries first
+            del self[command_id]
+        self._by_id[command_id] = command
+        self._by_key[self._key(command)] = command
+        self._by_guild.setdefault(command.guild_id, {})[command_id] = command
+
+    def __delitem__(self, command_id: int):
+        command = self._by_id.pop(command_id)
+        key = self._key(command)
+        if self._by_key.get(key) is command:
+            del self._by_key[key]
+        scope = self._by_guild[command.guild_id]
+        del scope[command_id]
+        if not scope:
+            del self._by_guild[command.guild_id]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._by_id)
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, command_id: object):
+        return command_id in self._by_id
+
+    def add(self, command: 'ApplicationCommand'):
+        self[command.id] = command
+
+    def find(
+            self, name: str, type: CommandType = CommandType.SLASH, guild_id: Optional[int] = None
+    ) -> Optional['ApplicationCommand']:
+        """
+        Returns the command registered under the name and type in a guild or globally
+        """
+        return self._by_key.get((name, type, guild_id))
+
+    def scope(self, guild_id: Optional[int]) -> Mapping[int, 'ApplicationCommand']:
+        """
+        Returns a read only view of the commands of a guild or of the global scope
+        """
+        return MappingProxyType(self._by_guild.get(guild_id, {}))
+
+    @property
+    def guild_ids(self) -> Tuple[Optional[int], ...]:
+        return tuple(self._by_guild)
+
+    def drop_scope(self, guild_id: Optional[int]):
+        """
+        Removes every command of a guild or of the global scope
+        """
+        for command in list(self._by_guild.get(guild_id, {}).values()):
+            del self[command.id]
+
+    def clear(self):
+        self._by_id.clear()
+        self._by_key.clear()
+        self._by_guild.clear()
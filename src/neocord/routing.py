@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+from .cache import TTLCache
+from .cooldown import Cooldown
+from types import MappingProxyType
+from typing import Any, Callable, Optional, Tuple, Dict, Mapping
+
+
+RouteKey = Tuple[int, Optional[str], Optional[str]]
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    """
+    Represents everything needed to invoke a single application command route
+    """
+    cog: Any
+    handler: Callable
+    binder: Optional[Callable] = None
+    check: Optional[Callable] = None
+    check_ttl: Optional[float] = None
+    before_invoke: Optional[Callable] = None
+    after_invoke: Optional[Callable] = None
+    autocomplete: Optional[Callable] = None
+    autocomplete_binder: Optional[Callable] = None
+    autocomplete_cache: Optional[TTLCache] = None
+    subhandler: Optional[Callable] = None
+    subbinder: Optional[Callable] = None
+    concurrency: Optional[int] = None
+    cooldown: Optional[Cooldown] = None
+    profile_rate: Optional[float] = None
+
+
+def _compile_routes(
+        table: Mapping[RouteKey, Endpoint],
+        commands: Dict[int, Dict[Tuple[Optional[str], Optional[str]], Endpoint]]
+) -> Mapping[RouteKey, Endpoint]:
+    """
+    Returns a new read-only route table with the routes of the given commands merged into it
+    """
+    compiled = dict(table)
+    for command_id, routes in commands.items():
+        for (group, subcommand), endpoint in routes.items():
+            compiled[(command_id, group, subcommand)] = endpoint
+    return MappingProxyType(compiled)
@@ -0,0 +1,223 @@
+import time
+import asyncio
+from collections import deque
+from .enums import OverflowPolicy
+from typing import Callable, Coroutine, Optional, Any, Dict, Deque, Hashable
+
+
+class _Job:
+    __slots__ = ('factory', 'command_id', 'limit', 'guild_id', 'queued_at')
+
+    def __init__(
+            self,
+            factory: Callable[[], Coroutine],
+            command_id: Hashable,
+            limit: Optional[int],
+            guild_id: Optional[int]
+    ):
+        self.factory = factory
+        self.command_id = command_id
+        self.limit = limit
+        self.guild_id = guild_id
+        self.queued_at = time.perf_counter()
+
+
+class Scheduler:
+    """
+    Runs application command handlers under global, per-command and per-guild concurrency caps.
+    Invocations that can not start right away wait in a bounded queue, once the queue is full
+    the overflow policy decides whether to wait for space, reject or defer the interaction.
+    """
+
+    def __init__(
+            self,
+            *,
+            max_concurrency: Optional[int] = None,
+            command_concurrency: Optional[int] = None,
+            guild_concurrency: Optional[int] = None,
+            max_queue: Optional[int] = None,
+            overflow: OverflowPolicy = OverflowPolicy.WAIT,
+            busy_message: str = 'The bot is busy right now, please try again in a moment.',
+            spawn: Callable[[Coroutine], asyncio.Task] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.command_concurrency = command_concurrency
+        self.guild_concurrency = guild_concurrency
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.busy_message = busy_message
+        self._spawn = spawn or asyncio.ensure_future
+        self._pending: Deque[_Job] = deque()
+        self._space_waiters: Deque[asyncio.Future] = deque()
+        self._running = 0
+        self._by_command: Dict[Hashable, int] = {}
+        self._by_guild: Dict[int, int] = {}
+        self._closed = False
+        self.started = 0
+        self.rejected = 0
+        self.deferred = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def running(self) -> int:
+        """
+        Returns the number of handlers currently running
+        """
+        return self._running
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns the number of invocations waiting for a free slot
+        """
+        return len(self._pending)
+
+    @property
+    def average_wait(self) -> float:
+        """
+        Returns the mean time in seconds invocations spent in the queue
+        """
+        return self.total_wait / self.started if self.started else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the scheduler counters
+        """
+        return {
+            'running': self._running,
+            'queue_depth': len(self._pending),
+            'started': self.started,
+            'rejected': self.rejected,
+            'deferred': self.deferred,
+            'average_wait': self.average_wait,
+            'max_wait': self.max_wait,
+        }
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self) -> int:
+        """
+        Stops starting new handlers, drops the queued invocations and refuses further ones.
+        Handlers already running are left alone.
+        Returns the number of dropped invocations.
+        """
+        self._closed = True
+        dropped = len(self._pending)
+        self.rejected += dropped
+        self._pending.clear()
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        return dropped
+
+    def _can_run(self, job: _Job) -> bool:
+        if self.max_concurrency is not None and self._running >= self.max_concurrency:
+            return False
+        limit = job.limit if job.limit is not None else self.command_concurrency
+        if limit is not None and self._by_command.get(job.command_id, 0) >= limit:
+            return False
+        if (
+                self.guild_concurrency is not None
+                and job.guild_id is not None
+                and self._by_guild.get(job.guild_id, 0) >= self.guild_concurrency
+        ):
+            return False
+        return True
+
+    def _start(self, job: _Job):
+        waited = time.perf_counter() - job.queued_at
+        self.started += 1
+        self.total_wait += waited
+        if waited > self.max_wait:
+            self.max_wait = waited
+        self._running += 1
+        self._by_command[job.command_id] = self._by_command.get(job.command_id, 0) + 1
+        if job.guild_id is not None:
+            self._by_guild[job.guild_id] = self._by_guild.get(job.guild_id, 0) + 1
+        task = self._spawn(job.factory())
+        task.add_done_callback(lambda _: self._release(job))
+
+    def _release(self, job: _Job):
+        self._running -= 1
+        count = self._by_command[job.command_id] - 1
+        if count:
+            self._by_command[job.command_id] = count
+        else:
+            del self._by_command[job.command_id]
+        if job.guild_id is not None:
+            count = self._by_guild[job.guild_id] - 1
+            if count:
+                self._by_guild[job.guild_id] = count
+            else:
+                del self._by_guild[job.guild_id]
+        self._drain()
+
+    def _drain(self):
+        if self._closed or not self._pending:
+            return
+        blocked = deque()
+        while self._pending:
+            if self.max_concurrency is not None and self._running >= self.max_concurrency:
+                break
+            job = self._pending.popleft()
+            if self._can_run(job):
+                self._start(job)
+            else:
+                blocked.append(job)
+        blocked.extend(self._pending)
+        self._pending = blocked
+        free = self.max_queue - len(self._pending) if self.max_queue is not None else len(self._space_waiters)
+        while self._space_waiters and free > 0:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def _queue_full(self) -> bool:
+        return self.max_queue is not None and len(self._pending) >= self.max_queue
+
+    async def submit(
+            self,
+            ctx: Any,
+            factory: Callable[[], Coroutine],
+            *,
+            command_id: Hashable,
+            limit: Optional[int] = None,
+    ) -> bool:
+        """
+        Schedules the coroutine returned by the factory for the given context.
+        Returns False if the invocation was rejected.
+        """
+        if self._closed:
+            self.rejected += 1
+            return False
+        guild_id = ctx.interaction.guild_id
+        job = _Job(factory, command_id, limit, guild_id)
+        if not self._pending and self._can_run(job):
+            self._start(job)
+            return True
+
+        if self._queue_full():
+            if self.overflow is OverflowPolicy.REJECT:
+                self.rejected += 1
+                await ctx.send_response(self.busy_message, ephemeral=True, fetch_message=False)
+                return False
+            if self.overflow is OverflowPolicy.DEFER and not ctx.responded:
+                self.deferred += 1
+                await ctx.defer()
+                ctx._auto_deferred = True
+            while self._queue_full():
+                waiter = asyncio.get_running_loop().create_future()
+                self._space_waiters.append(waiter)
+                await waiter
+                if self._closed:
+                    self.rejected += 1
+                    return False
+
+        self._pending.append(job)
+        self._drain()
+        return True
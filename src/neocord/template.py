@@ -0,0 +1,101 @@
+import re
+import json
+import discord
+from string import Formatter
+from discord.utils import MISSING
+from .utils import _handle_send_prams
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+
+__all__ = ['ResponseTemplate', 'RenderedResponse']
+
+_TOKEN = re.compile(r'\\u0000(\d+)\\u0000')
+_formatter = Formatter()
+
+
+class RenderedResponse:
+    """
+    Encoded message data of a filled response template
+    """
+
+    __slots__ = ('template', 'data')
+
+    def __init__(self, template: 'ResponseTemplate', data: str):
+        self.template = template
+        self.data = data
+
+    def encode(self, *, ephemeral: bool = False, callback: bool = False) -> bytes:
+        data = self.data
+        if ephemeral:
+            data = '{"flags":64}' if data == '{}' else '{"flags":64,' + data[1:]
+        if callback:
+            data = '{"type":4,"data":' + data + '}'
+        return data.encode('utf-8')
+
+
+class ResponseTemplate:
+    """
+    Message skeleton whose embeds and components are converted to JSON once.
+    Strings may hold `str.format` style placeholders, filled on every `render` call
+    without touching the static parts of the message.
+    """
+
+    __slots__ = ('_parts', '_fields', 'fields', 'views')
+
+    def __init__(
+            self,
+            content: Optional[str] = MISSING,
+            *,
+            tts: bool = False,
+            embed: Optional[discord.Embed] = None,
+            embeds: Optional[List[discord.Embed]] = None,
+            view: Optional[discord.ui.View] = None,
+            views: Optional[List[discord.ui.View]] = None,
+            allowed_mentions: Optional[discord.AllowedMentions] = None,
+    ):
+        payload, _, _ = _handle_send_prams(
+            content=content, tts=tts, embed=embed, embeds=embeds,
+            view=view, views=views, allowed_mentions=allowed_mentions)
+        self.views: Sequence[discord.ui.View] = [view] if view else list(views or [])
+        self._fields: List[Tuple[str, Optional[str], str]] = []
+        # placeholders become NUL delimited tokens that survive json encoding as \u0000<index>\u0000
+        encoded = json.dumps(self._tokenize(payload), separators=(',', ':'), ensure_ascii=True)
+        self._parts: List[Union[str, int]] = []
+        position = 0
+        for match in _TOKEN.finditer(encoded):
+            self._parts.append(encoded[position:match.start()])
+            self._parts.append(int(match.group(1)))
+            position = match.end()
+        self._parts.append(encoded[position:])
+        self.fields = frozenset(name for name, _, _ in self._fields)
+
+    def _tokenize(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._tokenize(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._tokenize(item) for item in value]
+        if not isinstance(value, str) or '{' not in value and '}' not in value:
+            return value
+        pieces = []
+        for literal, name, spec, conversion in _formatter.parse(value):
+            pieces.append(literal.replace('\0', ''))
+            if name is not None:
+                if not name:
+                    raise ValueError('Template placeholders must be named')
+                pieces.append(f'\0{len(self._fields)}\0')
+                self._fields.append((name, conversion, spec))
+        return ''.join(pieces)
+
+    def render(self, **values: Any) -> RenderedResponse:
+        """
+        Fills the placeholders and returns the response ready to be sent
+        """
+        chunks = []
+        for part in self._parts:
+            if isinstance(part, str):
+                chunks.append(part)
+                continue
+            name, conversion, spec = self._fields[part]
+            value = _formatter.convert_field(values[name], conversion) if conversion else values[name]
+            chunks.append(json.dumps(format(value, spec), ensure_ascii=True)[1:-1])
+        return RenderedResponse(self, ''.join(chunks))
@@ -1,10 +1,34 @@
+import os
 import json
 import discord
+from .files import StreamedFile
 from .modal import Modal
 from discord.http import Route
 from discord.utils import MISSING
 from .enums import CommandType
-from typing import Optional, Any, Union, List, Dict, Sequence
+from typing import Optional, Any, Union, List, Dict, Sequence, Callable
+
+
+JSONEncoder = Callable[[Any], Union[str, bytes]]
+
+
+def _to_json(obj: Any) -> str:
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=True)
+
+
+def _json_bytes(encoder: JSONEncoder, obj: Any) -> bytes:
+    encoded = encoder(obj)
+    return encoded.encode('utf-8') if isinstance(encoded, str) else encoded
+
+
+FileLike = Union[discord.File, str, os.PathLike]
+
+
+def _as_file(file: FileLike) -> discord.File:
+    # paths are streamed from disk instead of being read into memory first
+    if isinstance(file, (str, os.PathLike)):
+        return StreamedFile(file)
+    return file
 
 
 def _handle_edit_params(
@@ -14,8 +38,8 @@ def _handle_edit_params(
         embeds: List[discord.Embed] = MISSING,
         view: Optional[discord.ui.View] = MISSING,
         views: List[discord.ui.View] = MISSING,
-        file: Optional[discord.File] = MISSING,
-        files: List[discord.File] = MISSING,
+        file: Optional[FileLike] = MISSING,
+        files: List[FileLike] = MISSING,
         allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
 ):
     payload: Dict[str, Any] = {}
@@ -53,10 +77,10 @@ def _handle_edit_params(
             container.extend(components)
         payload['components'] = container
 
-    if file is not MISSING:
-        fs = [file]
-    elif files is not MISSING:
-        fs = files
+    if file is not MISSING and file is not None:
+        fs = [_as_file(file)]
+    elif files is not MISSING and files is not None:
+        fs = [_as_file(f) for f in files]
     else:
         fs = []
 
@@ -78,7 +102,7 @@ def _handle_edit_params(
                     'content_type': 'application/octet-stream',
                 }
             )
-    return payload, form
+    return payload, form, fs
 
 
 def _handle_send_prams(
@@ -86,8 +110,8 @@ def _handle_send_prams(
         content: Optional[Union[str, Any]] = MISSING,
         tts: bool = False,
         ephemeral: bool = False,
-        file: Optional[discord.File] = None,
-        files: Sequence[discord.File] = None,
+        file: Optional[FileLike] = None,
+        files: Sequence[FileLike] = None,
         embed: Optional[discord.Embed] = None,
         embeds: Optional[List[Optional[discord.Embed]]] = None,
         allowed_mentions: Optional[discord.AllowedMentions] = None,
@@ -117,7 +141,7 @@ def _handle_send_prams(
         payload['embeds'] = [embed.to_dict() for embed in embeds]
 
     if allowed_mentions:
-        payload['allowed_mentions'] = allowed_mentions
+        payload['allowed_mentions'] = allowed_mentions.to_dict()
 
     if view:
         payload['components'] = view.to_components()
@@ -132,9 +156,9 @@ def _handle_send_prams(
         payload['flags'] = 64
 
     if file:
-        fs = [file]
+        fs = [_as_file(file)]
     elif files:
-        fs = files
+        fs = [_as_file(f) for f in files]
     else:
         fs = []
 
@@ -156,4 +180,4 @@ def _handle_send_prams(
                     'content_type': 'application/octet-stream',
                 }
             )
-    return payload, form
+    return payload, form, fs